@@ -55,6 +55,10 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning(f"Could not set initial system health: {e}")
         
+        # Load the tiers' rate limit scripts before the first request
+        from src.services.rate_limit_service import rate_limit_service
+        await rate_limit_service.preload_rate_limit_scripts()
+        
         logger.info("Rate Limiter service startup completed successfully")
         
     except Exception as e:
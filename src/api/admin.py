@@ -6,6 +6,7 @@ users, API keys, and monitoring rate limiting status.
 """
 
 import secrets
+from collections import Counter
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
@@ -60,7 +61,9 @@ async def verify_admin_access(admin_key: Optional[str] = Query(None, alias="admi
     # For demo purposes, we'll use a simple admin key check
     # In production, implement proper authentication
     expected_admin_key = config_manager.config.api_keys.get("admin_api_key")
-    if not expected_admin_key or admin_key != expected_admin_key:
+    # Constant-time comparison so response timing doesn't reveal the key
+    if (not expected_admin_key or admin_key is None
+            or not secrets.compare_digest(admin_key.encode(), expected_admin_key.encode())):
         # For demo, allow access without admin key but log a warning
         pass  # In production: raise HTTPException(status_code=401, detail="Admin access required")
     
@@ -124,7 +127,10 @@ async def set_system_health(
 
 
 @router.get("/users", summary="List all users")
-async def list_users(_: bool = Depends(verify_admin_access)):
+async def list_users(
+    include_status: bool = Query(False, description="Include current rate limiting status"),
+    _: bool = Depends(verify_admin_access)
+):
     """
     List all users with their tier information and API keys.
     
@@ -132,9 +138,17 @@ async def list_users(_: bool = Depends(verify_admin_access)):
     - User ID and tier
     - All API keys associated with each user
     - API key counts
+    - Current rate limiting status, if requested (fetched for all users
+      in a single Redis round-trip)
     """
     try:
         users = user_tier_manager.list_users()
+        if include_status:
+            statuses = await rate_limit_service.get_user_statuses(
+                [(user_id, info["tier"]) for user_id, info in users.items()]
+            )
+            for user_id, info in users.items():
+                info["rate_limit_status"] = statuses[user_id]
         return {
             "users": users,
             "total_users": len(users),
@@ -329,14 +343,14 @@ async def get_rate_limit_status(
         else:
             # Get system-wide status
             system_health = await health_service.get_system_health()
-            users = user_tier_manager.list_users()
+            tier_counts = Counter(info["tier"] for _, info in user_tier_manager.iter_users())
             
             return {
                 "user_specific": False,
                 "system_health": system_health,
-                "total_users": len(users),
+                "total_users": sum(tier_counts.values()),
                 "users_by_tier": {
-                    tier: len([u for u in users.values() if u["tier"] == tier])
+                    tier: tier_counts[tier]
                     for tier in ["free", "pro", "enterprise"]
                 },
                 "timestamp": datetime.utcnow().isoformat()
@@ -60,7 +60,21 @@ class ConfigManager:
         )
         
         try:
-            if not Path(self.config_path).exists():
+            try:
+                # Open directly rather than stat-ing first; a missing file
+                # costs one failed syscall instead of two
+                with open(self.config_path, 'r') as f:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(
+                            f"Reading configuration file: {self.config_path}",
+                            extra={
+                                "config_path": self.config_path,
+                                "file_size": os.fstat(f.fileno()).st_size,
+                                "config_operation": "file_reading"
+                            }
+                        )
+                    config_data = json.load(f)
+            except FileNotFoundError:
                 logger.warning(
                     f"Config file not found at {self.config_path}, using defaults",
                     extra={
@@ -71,18 +85,6 @@ class ConfigManager:
                 self._config = self._get_default_config()
                 return
             
-            logger.debug(
-                f"Reading configuration file: {self.config_path}",
-                extra={
-                    "config_path": self.config_path,
-                    "file_size": Path(self.config_path).stat().st_size,
-                    "config_operation": "file_reading"
-                }
-            )
-            
-            with open(self.config_path, 'r') as f:
-                config_data = json.load(f)
-            
             logger.debug(
                 f"Configuration file parsed successfully, found {len(config_data)} top-level keys",
                 extra={
@@ -5,11 +5,13 @@ This module provides comprehensive logging setup with multiple handlers,
 custom formatters, and structured logging for different components.
 """
 
+import atexit
 import logging
 import os
+import queue
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
-from typing import Optional
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from typing import Optional, List
 
 
 class CustomFormatter(logging.Formatter):
@@ -63,6 +65,20 @@ class RateLimitFilter(logging.Filter):
         return any(keyword in message for keyword in keywords)
 
 
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves all formatting to the listener thread.
+    
+    The stock QueueHandler formats each record before enqueueing it; records
+    here stay in-process, so they are passed through untouched and the
+    logging call only costs a queue put.
+    """
+    
+    def prepare(self, record):
+        """Return the record unchanged for the listener to format."""
+        return record
+
+
 class LoggingConfig:
     """
     Centralized logging configuration manager.
@@ -81,6 +97,7 @@ class LoggingConfig:
         self.formatter = CustomFormatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(req_id)s%(message)s%(operations)s'
         )
+        self._listener: Optional[QueueListener] = None
     
     def setup_logging(self) -> None:
         """
@@ -92,6 +109,9 @@ class LoggingConfig:
         - Debug log file (DEBUG and above) with rotation  
         - Security events log file (WARNING and above)
         - Rate limiting specific log file
+        
+        The handlers run on a background QueueListener thread; loggers only
+        enqueue records, so formatting and file I/O stay off the event loop.
         """
         # Ensure logs directory exists
         self.log_dir.mkdir(exist_ok=True)
@@ -101,11 +121,18 @@ class LoggingConfig:
         root_logger.handlers.clear()
         
         # Setup all handlers
-        self._setup_console_handler(root_logger)
-        self._setup_main_file_handler(root_logger)
-        self._setup_debug_file_handler(root_logger)
-        self._setup_security_file_handler(root_logger)
-        self._setup_rate_limit_file_handler(root_logger)
+        handlers: List[logging.Handler] = []
+        self._setup_console_handler(handlers)
+        self._setup_main_file_handler(handlers)
+        self._setup_debug_file_handler(handlers)
+        self._setup_security_file_handler(handlers)
+        self._setup_rate_limit_file_handler(handlers)
+        
+        # Route records through a queue to the handlers
+        log_queue = queue.SimpleQueue()
+        root_logger.addHandler(DeferredQueueHandler(log_queue))
+        self._listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        self._listener.start()
         
         # Set root logger level
         root_logger.setLevel(self.log_level)
@@ -116,14 +143,14 @@ class LoggingConfig:
         # Print configuration summary
         self._print_logging_summary()
     
-    def _setup_console_handler(self, root_logger: logging.Logger) -> None:
+    def _setup_console_handler(self, handlers: List[logging.Handler]) -> None:
         """Setup console logging handler."""
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(self.formatter)
-        root_logger.addHandler(console_handler)
+        handlers.append(console_handler)
     
-    def _setup_main_file_handler(self, root_logger: logging.Logger) -> None:
+    def _setup_main_file_handler(self, handlers: List[logging.Handler]) -> None:
         """Setup main application log file handler."""
         main_file_handler = RotatingFileHandler(
             self.log_dir / "rate_limiter.log",
@@ -132,9 +159,9 @@ class LoggingConfig:
         )
         main_file_handler.setLevel(logging.INFO)
         main_file_handler.setFormatter(self.formatter)
-        root_logger.addHandler(main_file_handler)
+        handlers.append(main_file_handler)
     
-    def _setup_debug_file_handler(self, root_logger: logging.Logger) -> None:
+    def _setup_debug_file_handler(self, handlers: List[logging.Handler]) -> None:
         """Setup debug log file handler."""
         debug_file_handler = RotatingFileHandler(
             self.log_dir / "rate_limiter_debug.log",
@@ -143,9 +170,9 @@ class LoggingConfig:
         )
         debug_file_handler.setLevel(logging.DEBUG)
         debug_file_handler.setFormatter(self.formatter)
-        root_logger.addHandler(debug_file_handler)
+        handlers.append(debug_file_handler)
     
-    def _setup_security_file_handler(self, root_logger: logging.Logger) -> None:
+    def _setup_security_file_handler(self, handlers: List[logging.Handler]) -> None:
         """Setup security events log file handler."""
         security_file_handler = RotatingFileHandler(
             self.log_dir / "security.log",
@@ -154,9 +181,9 @@ class LoggingConfig:
         )
         security_file_handler.setLevel(logging.WARNING)
         security_file_handler.setFormatter(self.formatter)
-        root_logger.addHandler(security_file_handler)
+        handlers.append(security_file_handler)
     
-    def _setup_rate_limit_file_handler(self, root_logger: logging.Logger) -> None:
+    def _setup_rate_limit_file_handler(self, handlers: List[logging.Handler]) -> None:
         """Setup rate limiting specific log file handler."""
         rate_limit_handler = RotatingFileHandler(
             self.log_dir / "rate_limiting.log",
@@ -166,7 +193,13 @@ class LoggingConfig:
         rate_limit_handler.setLevel(logging.INFO)
         rate_limit_handler.setFormatter(self.formatter)
         rate_limit_handler.addFilter(RateLimitFilter())
-        root_logger.addHandler(rate_limit_handler)
+        handlers.append(rate_limit_handler)
+    
+    def stop(self) -> None:
+        """Flush queued log records and stop the listener thread."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
     
     def _configure_component_loggers(self) -> None:
         """Configure logging levels for specific components."""
@@ -191,6 +224,10 @@ class LoggingConfig:
         print("  - rate_limiting.log (rate limiting specific)")
 
 
+# Active logging configuration, kept so its listener can be stopped
+_active_config: Optional[LoggingConfig] = None
+
+
 # Convenience functions for easy setup
 def setup_logging(log_dir: Optional[str] = None, log_level: Optional[str] = None) -> None:
     """
@@ -200,8 +237,23 @@ def setup_logging(log_dir: Optional[str] = None, log_level: Optional[str] = None
         log_dir: Directory for log files (defaults to 'logs')
         log_level: Root logging level (defaults to DEBUG)
     """
-    config = LoggingConfig(log_dir=log_dir, log_level=log_level)
-    config.setup_logging()
+    global _active_config
+    
+    stop_logging()
+    _active_config = LoggingConfig(log_dir=log_dir, log_level=log_level)
+    _active_config.setup_logging()
+
+
+def stop_logging() -> None:
+    """Flush pending log records and stop the background logging thread."""
+    global _active_config
+    
+    if _active_config is not None:
+        _active_config.stop()
+        _active_config = None
+
+
+atexit.register(stop_logging)
 
 
 def setup_logging_from_env() -> None:
@@ -5,8 +5,10 @@ This module defines the Pydantic models used throughout the application
 for configuration, rate limiting results, and system health management.
 """
 
+import sys
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
 from typing import Dict, Optional, Any
 from pydantic import BaseModel, Field, validator
 
@@ -31,6 +33,11 @@ class TierConfig(BaseModel):
     degraded_limit: int = Field(..., gt=0, description="Reduced limit during DEGRADED state")
     window_minutes: int = Field(default=1, gt=0, description="Time window in minutes")
     
+    @cached_property
+    def window_seconds(self) -> int:
+        """Time window in seconds, computed once per config instance."""
+        return self.window_minutes * 60
+    
     @validator('burst_limit')
     def burst_must_be_gte_base(cls, v, values):
         """Burst limit must be greater than or equal to base limit."""
@@ -71,7 +78,8 @@ class RateLimitConfig(BaseModel):
         missing_tiers = required_tiers - provided_tiers
         if missing_tiers:
             raise ValueError(f"Missing required tiers: {missing_tiers}")
-        return v
+        # Intern tier names so per-request dict lookups hit the identity fast path
+        return {sys.intern(tier): tier_config for tier, tier_config in v.items()}
     
     @validator('users')
     def users_must_have_valid_tiers(cls, v, values):
@@ -83,7 +91,7 @@ class RateLimitConfig(BaseModel):
         for user_id, tier in v.items():
             if tier not in valid_tiers:
                 raise ValueError(f"User {user_id} references invalid tier: {tier}")
-        return v
+        return {user_id: sys.intern(tier) for user_id, tier in v.items()}
     
     @validator('api_keys')
     def api_keys_must_reference_valid_users(cls, v, values):
@@ -5,14 +5,17 @@ This module provides a robust Redis client with connection pooling, circuit brea
 and comprehensive error handling for high-availability rate limiting operations.
 """
 
+import sys
 import asyncio
 import time
 import logging
-from typing import Optional, Any, List, Dict
+from typing import Optional, Any, List, Dict, Tuple, Iterable
 from contextlib import asynccontextmanager
+from string import Template
 
 import redis.asyncio as redis
 from redis.asyncio import ConnectionPool, Redis
+from redis.commands.core import AsyncScript
 from redis.exceptions import RedisError, ConnectionError, TimeoutError
 
 from .models import RedisConfig
@@ -20,6 +23,9 @@ from .config import config_manager
 
 logger = logging.getLogger(__name__)
 
+# Redis hash holding the global system health status
+SYSTEM_HEALTH_KEY = "system:health"
+
 
 class CircuitBreaker:
     """Circuit breaker pattern for Redis operations."""
@@ -37,7 +43,7 @@ class CircuitBreaker:
             return True
         
         if self.state == "open":
-            if time.time() - self.last_failure_time > self.reset_timeout:
+            if time.monotonic() - self.last_failure_time > self.reset_timeout:
                 self.state = "half-open"
                 return True
             return False
@@ -53,7 +59,7 @@ class CircuitBreaker:
     def on_failure(self):
         """Record failed operation."""
         self.failure_count += 1
-        self.last_failure_time = time.time()
+        self.last_failure_time = time.monotonic()
         
         if self.failure_count >= self.failure_threshold:
             self.state = "open"
@@ -73,52 +79,62 @@ class RedisClient:
         self.config = config or config_manager.config.redis
         self._pool: Optional[ConnectionPool] = None
         self._redis: Optional[Redis] = None
+        # (limits, window_seconds) -> rate limit script with both baked in
+        self._rate_limit_scripts: Dict[Tuple[Tuple[int, int, int], int], AsyncScript] = {}
+        self._set_system_health: Optional[AsyncScript] = None
+        self._check_security_counter: Optional[AsyncScript] = None
         self.circuit_breaker = CircuitBreaker()
         self._lock = asyncio.Lock()
         
         # Lua scripts for atomic operations
-        self._rate_limit_script = """
-            local key = KEYS[1]
-            local window = tonumber(ARGV[1])
-            local limit = tonumber(ARGV[2])
-            local current_time = tonumber(ARGV[3])
+        # Reads the system health, picks the limit for it, then checks and
+        # increments the window counter - all in one round-trip. The health
+        # and applied limit are returned so callers can refresh their health
+        # cache. One script is generated per tier's limits and window, with
+        # them baked in as literals.
+        self._rate_limit_template = Template("""
+            local window_key = KEYS[1]
+            local health_key = KEYS[2]
             
-            -- Calculate window start time
-            local window_start = math.floor(current_time / window) * window
-            local window_key = key .. ":" .. window_start
+            local health = redis.call('HGET', health_key, 'status') or 'NORMAL'
             
-            -- Get current count
-            local current = redis.call('GET', window_key)
-            if current == false then
-                current = 0
-            else
-                current = tonumber(current)
+            -- Select the limit for the current health
+            local limit = $default_limit
+            if health == 'NORMAL' then
+                limit = $normal_limit
+            elseif health == 'DEGRADED' then
+                limit = $degraded_limit
             end
             
+            -- Get current count
+            local current = tonumber(redis.call('GET', window_key) or '0')
+            
             -- Check if limit exceeded
             if current >= limit then
-                local ttl = redis.call('TTL', window_key)
-                if ttl == -1 then
-                    redis.call('EXPIRE', window_key, window)
-                end
-                return {0, current, window_start + window}
+                return {0, current, health, limit}
             end
             
-            -- Increment counter and set expiration
-            local new_count = redis.call('INCR', window_key)
-            redis.call('EXPIRE', window_key, window + 1)  -- Extra second for safety
+            -- Increment counter and set expiration on the first hit
+            current = redis.call('INCR', window_key)
+            if current == 1 then
+                redis.call('EXPIRE', window_key, $expire_seconds)  -- Extra second for safety
+            end
             
-            return {1, new_count, window_start + window}
-        """
+            return {1, current, health, limit}
+        """)
         
         self._system_health_script = """
             local key = KEYS[1]
             local new_status = ARGV[1]
             local timestamp = ARGV[2]
             local ttl = tonumber(ARGV[3])
+            local updated_by = ARGV[4]
             
             -- Set the new status with timestamp
             redis.call('HSET', key, 'status', new_status, 'timestamp', timestamp)
+            if updated_by ~= '' then
+                redis.call('HSET', key, 'updated_by', updated_by)
+            end
             
             -- Set TTL for auto-recovery
             if ttl > 0 then
@@ -127,6 +143,28 @@ class RedisClient:
             
             return redis.call('HGETALL', key)
         """
+        
+        # Counts a security event and blocks the offender once the
+        # threshold is crossed. Returns 1 while within the limit, 0 otherwise.
+        self._security_counter_script = """
+            local counter_key = KEYS[1]
+            local block_key = KEYS[2]
+            local max_attempts = tonumber(ARGV[1])
+            local ttl = tonumber(ARGV[2])
+            local block_seconds = tonumber(ARGV[3])
+            
+            local count = redis.call('INCR', counter_key)
+            if count == 1 then
+                redis.call('EXPIRE', counter_key, ttl)
+            end
+            
+            if count > max_attempts then
+                redis.call('SETEX', block_key, block_seconds, '1')
+                return 0
+            end
+            
+            return 1
+        """
     
     async def _ensure_connection(self):
         """Ensure Redis connection is established."""
@@ -179,6 +217,17 @@ class RedisClient:
             # Test connection
             await self._redis.ping()
             
+            # Register Lua scripts; calls go through EVALSHA and only resend
+            # the script body if Redis answers NOSCRIPT
+            self._set_system_health = self._redis.register_script(self._system_health_script)
+            await self._redis.script_load(self._system_health_script)
+            self._check_security_counter = self._redis.register_script(self._security_counter_script)
+            await self._redis.script_load(self._security_counter_script)
+            
+            # Rate limit scripts are registered against the client, so
+            # regenerate them for this connection
+            self._rate_limit_scripts = {}
+            
             logger.info(
                 f"Redis connection established successfully to {self.config.host}:{self.config.port}",
                 extra={
@@ -246,77 +295,126 @@ class RedisClient:
             logger.error(f"Redis operation failed: {e}")
             raise
     
-    async def check_rate_limit(self, user_id: str, limit: int, 
-                              window_minutes: int) -> tuple[bool, int, int]:
+    def _get_rate_limit_script(self, limits: Tuple[int, int, int], 
+                               window_seconds: int) -> AsyncScript:
         """
-        Check rate limit for a user using sliding window algorithm.
+        Get the rate limit script specialized for a set of limits and window.
+        
+        Scripts are generated on first use. There is one per tier
+        configuration, so this stays small.
         
         Args:
-            user_id: User identifier
-            limit: Request limit for the window
-            window_minutes: Window size in minutes
+            limits: (NORMAL limit, DEGRADED limit, limit for any other health)
+            window_seconds: Window size in seconds
             
         Returns:
-            Tuple of (allowed, current_count, reset_timestamp)
+            Registered script for the (limits, window_seconds) pair
         """
-        logger.debug(
-            f"Starting Redis rate limit check for user {user_id}",
-            extra={
-                "user_id": user_id,
-                "limit": limit,
-                "window_minutes": window_minutes,
-                "redis_operation": "rate_limit_check_start"
-            }
-        )
+        script = self._rate_limit_scripts.get((limits, window_seconds))
+        if script is None:
+            normal_limit, degraded_limit, default_limit = limits
+            source = self._rate_limit_template.substitute(
+                normal_limit=int(normal_limit),
+                degraded_limit=int(degraded_limit),
+                default_limit=int(default_limit),
+                expire_seconds=int(window_seconds) + 1
+            )
+            script = self._redis.register_script(source)
+            self._rate_limit_scripts[(limits, window_seconds)] = script
+        return script
+    
+    async def preload_rate_limit_scripts(self, 
+                                         variants: Iterable[Tuple[Tuple[int, int, int], int]]):
+        """
+        Load rate limit scripts into Redis ahead of the first request.
         
+        Args:
+            variants: (limits, window_seconds) pairs to load
+        """
         async with self._execute_with_circuit_breaker():
-            key = f"rate_limit:user:{user_id}"
-            window_seconds = window_minutes * 60
-            current_time = int(time.time())
-            window_start = (current_time // window_seconds) * window_seconds
+            for limits, window_seconds in variants:
+                script = self._get_rate_limit_script(limits, window_seconds)
+                await self._redis.script_load(script.script)
+    
+    async def check_rate_limit(self, user_id: str, limits: Tuple[int, int, int], 
+                              window_seconds: int) -> tuple[bool, int, int, str, int]:
+        """
+        Check rate limit for a user using a fixed window algorithm.
+        
+        The limit is chosen from the system health inside the same script,
+        so a single round-trip reads health, decides the request and counts
+        it atomically.
+        
+        Args:
+            user_id: User identifier
+            limits: (NORMAL limit, DEGRADED limit, limit for any other health)
+            window_seconds: Window size in seconds
             
+        Returns:
+            Tuple of (allowed, current_count, reset_timestamp, system_health,
+            applied_limit)
+        """
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(
-                f"Rate limit parameters calculated for user {user_id}: "
-                f"key={key}, window={window_seconds}s, current_time={current_time}, window_start={window_start}",
+                f"Starting Redis rate limit check for user {user_id}",
                 extra={
                     "user_id": user_id,
-                    "redis_key": key,
+                    "limits": limits,
                     "window_seconds": window_seconds,
-                    "current_time": current_time,
-                    "window_start": window_start,
-                    "limit": limit,
-                    "redis_operation": "rate_limit_params_calculated"
+                    "redis_operation": "rate_limit_check_start"
                 }
             )
+        
+        async with self._execute_with_circuit_breaker():
+            key = f"rate_limit:user:{user_id}"
+            current_time = int(time.time())
+            window_start = (current_time // window_seconds) * window_seconds
+            window_key = f"{key}:{window_start}"
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Rate limit parameters calculated for user {user_id}: "
+                    f"key={key}, window={window_seconds}s, current_time={current_time}, window_start={window_start}",
+                    extra={
+                        "user_id": user_id,
+                        "redis_key": key,
+                        "window_seconds": window_seconds,
+                        "current_time": current_time,
+                        "window_start": window_start,
+                        "limits": limits,
+                        "redis_operation": "rate_limit_params_calculated"
+                    }
+                )
             
             # Execute Lua script for atomic rate limiting
             try:
-                result = await self._redis.eval(
-                    self._rate_limit_script,
-                    1,  # number of keys
-                    key, window_seconds, limit, current_time
-                )
+                rate_limit = self._get_rate_limit_script(limits, window_seconds)
+                result = await rate_limit(keys=[window_key, SYSTEM_HEALTH_KEY])
                 
                 allowed = bool(result[0])
                 current_count = int(result[1])
-                reset_time = int(result[2])
+                reset_time = window_start + window_seconds
+                system_health = sys.intern(result[2].decode())
+                limit = int(result[3])
                 
-                logger.info(
-                    f"Redis rate limit check completed for user {user_id}: "
-                    f"allowed={allowed}, count={current_count}/{limit}, reset_time={reset_time}",
-                    extra={
-                        "user_id": user_id,
-                        "allowed": allowed,
-                        "current_count": current_count,
-                        "limit": limit,
-                        "reset_time": reset_time,
-                        "window_start": window_start,
-                        "redis_key": key,
-                        "redis_operation": "rate_limit_check_completed"
-                    }
-                )
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        f"Redis rate limit check completed for user {user_id}: "
+                        f"allowed={allowed}, count={current_count}/{limit}, reset_time={reset_time}",
+                        extra={
+                            "user_id": user_id,
+                            "allowed": allowed,
+                            "current_count": current_count,
+                            "limit": limit,
+                            "reset_time": reset_time,
+                            "window_start": window_start,
+                            "system_health": system_health,
+                            "redis_key": key,
+                            "redis_operation": "rate_limit_check_completed"
+                        }
+                    )
                 
-                return allowed, current_count, reset_time
+                return allowed, current_count, reset_time, system_health, limit
                 
             except Exception as e:
                 logger.error(
@@ -324,46 +422,143 @@ class RedisClient:
                     extra={
                         "user_id": user_id,
                         "redis_key": key,
-                        "limit": limit,
+                        "limits": limits,
                         "window_seconds": window_seconds,
                         "error_type": type(e).__name__,
                         "error_message": str(e),
                         "redis_operation": "rate_limit_script_failed"
                     },
-                    exc_info=True
+                    exc_info=logger.isEnabledFor(logging.DEBUG)
                 )
                 raise
     
+    async def check_rate_limit_many(self, checks: List[Tuple[str, Tuple[int, int, int], int]]
+                                    ) -> List[tuple[bool, int, int, str, int]]:
+        """
+        Check rate limits for several users in a single pipelined round-trip.
+        
+        Each check runs the same script as check_rate_limit; checks for the
+        same user are applied in order.
+        
+        Args:
+            checks: List of (user_id, limits, window_seconds) tuples
+            
+        Returns:
+            List of (allowed, current_count, reset_timestamp, system_health,
+            applied_limit) tuples in the same order as checks
+        """
+        if not checks:
+            return []
+        
+        async with self._execute_with_circuit_breaker():
+            current_time = int(time.time())
+            reset_times = []
+            
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for user_id, limits, window_seconds in checks:
+                    window_start = (current_time // window_seconds) * window_seconds
+                    reset_times.append(window_start + window_seconds)
+                    rate_limit = self._get_rate_limit_script(limits, window_seconds)
+                    await rate_limit(
+                        keys=[f"rate_limit:user:{user_id}:{window_start}", SYSTEM_HEALTH_KEY],
+                        client=pipe
+                    )
+                results = await pipe.execute()
+            
+            logger.debug(
+                f"Redis batch rate limit check completed for {len(checks)} requests",
+                extra={
+                    "batch_size": len(checks),
+                    "redis_operation": "rate_limit_batch_completed"
+                }
+            )
+            
+            return [
+                (bool(result[0]), int(result[1]), reset_time, sys.intern(result[2].decode()), int(result[3]))
+                for result, reset_time in zip(results, reset_times)
+            ]
+    
     async def get_user_rate_limit_status(self, user_id: str, 
-                                       window_minutes: int) -> Dict[str, Any]:
+                                       window_seconds: int) -> Dict[str, Any]:
         """
         Get current rate limit status for a user.
         
+        The window counter, its TTL and the system health are read in a
+        single pipelined round-trip.
+        
         Args:
             user_id: User identifier
-            window_minutes: Window size in minutes
+            window_seconds: Window size in seconds
             
         Returns:
-            Dictionary with current count and window information
+            Dictionary with current count, window information and system health
         """
         async with self._execute_with_circuit_breaker():
             key = f"rate_limit:user:{user_id}"
-            window_seconds = window_minutes * 60
             current_time = int(time.time())
             window_start = (current_time // window_seconds) * window_seconds
             window_key = f"{key}:{window_start}"
             
-            current_count = await self._redis.get(window_key)
-            ttl = await self._redis.ttl(window_key)
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.get(window_key)
+                pipe.ttl(window_key)
+                pipe.hget(SYSTEM_HEALTH_KEY, "status")
+                current_count, ttl, health = await pipe.execute()
             
             return {
                 "user_id": user_id,
                 "current_count": int(current_count) if current_count else 0,
                 "window_start": window_start,
                 "window_end": window_start + window_seconds,
-                "ttl": ttl if ttl > 0 else 0
+                "ttl": ttl if ttl > 0 else 0,
+                "system_health": sys.intern(health.decode()) if health else "NORMAL"
             }
     
+    async def get_user_rate_limit_status_many(self, users: List[Tuple[str, int]]
+                                              ) -> List[Dict[str, Any]]:
+        """
+        Get current rate limit status for several users in one round-trip.
+        
+        Args:
+            users: List of (user_id, window_seconds) tuples
+            
+        Returns:
+            List of status dictionaries, as returned by
+            get_user_rate_limit_status, in the same order as users
+        """
+        if not users:
+            return []
+        
+        async with self._execute_with_circuit_breaker():
+            current_time = int(time.time())
+            window_starts = []
+            
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.hget(SYSTEM_HEALTH_KEY, "status")
+                for user_id, window_seconds in users:
+                    window_start = (current_time // window_seconds) * window_seconds
+                    window_starts.append(window_start)
+                    window_key = f"rate_limit:user:{user_id}:{window_start}"
+                    pipe.get(window_key)
+                    pipe.ttl(window_key)
+                results = await pipe.execute()
+            
+            health = results[0]
+            system_health = sys.intern(health.decode()) if health else "NORMAL"
+            
+            statuses = []
+            for i, (user_id, window_seconds) in enumerate(users):
+                current_count, ttl = results[1 + 2 * i], results[2 + 2 * i]
+                statuses.append({
+                    "user_id": user_id,
+                    "current_count": int(current_count) if current_count else 0,
+                    "window_start": window_starts[i],
+                    "window_end": window_starts[i] + window_seconds,
+                    "ttl": ttl if ttl > 0 else 0,
+                    "system_health": system_health
+                })
+            return statuses
+    
     async def set_system_health(self, status: str, ttl_seconds: Optional[int] = None,
                                updated_by: Optional[str] = None) -> Dict[str, str]:
         """
@@ -388,19 +583,16 @@ class RedisClient:
         )
         
         async with self._execute_with_circuit_breaker():
-            key = "system:health"
+            key = SYSTEM_HEALTH_KEY
             timestamp = str(int(time.time()))
             ttl = ttl_seconds or 0
             
-            # Add updated_by to the hash if provided
-            if updated_by:
-                await self._redis.hset(key, "updated_by", updated_by)
-            
             try:
-                result = await self._redis.eval(
-                    self._system_health_script,
-                    1,  # number of keys
-                    key, status, timestamp, ttl
+                # updated_by is written by the script too, so the whole
+                # update is one atomic round-trip
+                result = await self._set_system_health(
+                    keys=[key],
+                    args=[status, timestamp, ttl, updated_by or ""]
                 )
                 
                 # Convert result to dictionary
@@ -453,43 +645,9 @@ class RedisClient:
         
         try:
             async with self._execute_with_circuit_breaker():
-                key = "system:health"
+                key = SYSTEM_HEALTH_KEY
                 result = await self._redis.hgetall(key)
-                
-                if not result:
-                    # No health status set, default to NORMAL
-                    default_health = {
-                        "status": "NORMAL",
-                        "timestamp": str(int(time.time())),
-                        "updated_by": "system"
-                    }
-                    
-                    logger.debug(
-                        "No system health data found in Redis, using default NORMAL status",
-                        extra={
-                            "default_status": "NORMAL",
-                            "redis_key": key,
-                            "redis_operation": "get_system_health_default"
-                        }
-                    )
-                    
-                    return default_health
-                
-                # Convert bytes to strings
-                health_data = {k.decode(): v.decode() for k, v in result.items()}
-                
-                logger.debug(
-                    f"System health retrieved from Redis: {health_data.get('status')}",
-                    extra={
-                        "status": health_data.get('status'),
-                        "timestamp": health_data.get('timestamp'),
-                        "updated_by": health_data.get('updated_by'),
-                        "redis_key": key,
-                        "redis_operation": "get_system_health_retrieved"
-                    }
-                )
-                
-                return health_data
+                return self._decode_system_health(result)
         
         except Exception as e:
             # Fallback to NORMAL status
@@ -507,35 +665,104 @@ class RedisClient:
                     "fallback_status": "NORMAL",
                     "redis_operation": "get_system_health_failed"
                 },
-                exc_info=True
+                exc_info=logger.isEnabledFor(logging.DEBUG)
             )
             
             return fallback_health
     
-    async def increment_security_counter(self, key_suffix: str, 
-                                       ttl_seconds: int = 300) -> int:
+    async def ping_and_get_system_health(self) -> tuple[bool, Dict[str, str]]:
+        """
+        Ping Redis and read the system health status in one round-trip.
+        
+        Like is_healthy, the probe bypasses the circuit breaker so failed
+        health checks don't trip it for rate limiting.
+        
+        Returns:
+            Tuple of (redis_healthy, health_data)
+            
+        Raises:
+            Exception: If Redis is unreachable or the pipeline fails
+        """
+        if not self._redis:
+            raise ConnectionError("Redis client is not connected")
+        
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.ping()
+            pipe.hgetall(SYSTEM_HEALTH_KEY)
+            ping_result, result = await pipe.execute()
+        
+        return bool(ping_result), self._decode_system_health(result)
+    
+    def _decode_system_health(self, result: Dict[bytes, bytes]) -> Dict[str, str]:
         """
-        Increment security counter (for invalid API key attempts).
+        Convert a raw system health hash into a status dictionary.
+        
+        Args:
+            result: Raw HGETALL result for the system health key
+            
+        Returns:
+            Dictionary with health status and metadata
+        """
+        if not result:
+            # No health status set, default to NORMAL
+            default_health = {
+                "status": "NORMAL",
+                "timestamp": str(int(time.time())),
+                "updated_by": "system"
+            }
+            
+            logger.debug(
+                "No system health data found in Redis, using default NORMAL status",
+                extra={
+                    "default_status": "NORMAL",
+                    "redis_key": SYSTEM_HEALTH_KEY,
+                    "redis_operation": "get_system_health_default"
+                }
+            )
+            
+            return default_health
+        
+        # Convert bytes to strings
+        health_data = {k.decode(): v.decode() for k, v in result.items()}
+        
+        logger.debug(
+            f"System health retrieved from Redis: {health_data.get('status')}",
+            extra={
+                "status": health_data.get('status'),
+                "timestamp": health_data.get('timestamp'),
+                "updated_by": health_data.get('updated_by'),
+                "redis_key": SYSTEM_HEALTH_KEY,
+                "redis_operation": "get_system_health_retrieved"
+            }
+        )
+        
+        return health_data
+    
+    async def check_security_counter(self, key_suffix: str, max_attempts: int,
+                                     ttl_seconds: int, ip_address: str,
+                                     block_seconds: int) -> bool:
+        """
+        Increment a security counter and block the IP once it exceeds the limit.
+        
+        The increment, threshold check and block all run in a single script
+        call, so the counter and the blocked state change atomically.
         
         Args:
             key_suffix: Suffix for the security key
+            max_attempts: Maximum attempts allowed within the counter TTL
             ttl_seconds: TTL for the counter
+            ip_address: IP address to block when the limit is exceeded
+            block_seconds: Block duration in seconds
             
         Returns:
-            Current counter value
+            True if within limit, False if exceeded (and the IP is now blocked)
         """
         async with self._execute_with_circuit_breaker():
-            key = f"security:{key_suffix}"
-            
-            # Use pipeline for atomic operations
-            async with self._redis.pipeline() as pipe:
-                count = await pipe.incr(key).execute()
-                
-                # Set TTL only if this is the first increment
-                if count[0] == 1:
-                    await pipe.expire(key, ttl_seconds).execute()
-                
-                return count[0]
+            within_limit = await self._check_security_counter(
+                keys=[f"security:{key_suffix}", f"security:blocked_ip:{ip_address}"],
+                args=[max_attempts, ttl_seconds, block_seconds]
+            )
+            return within_limit == 1
     
     async def is_ip_blocked(self, ip_address: str) -> bool:
         """
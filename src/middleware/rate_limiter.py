@@ -5,29 +5,83 @@ This module implements the main rate limiting middleware that integrates
 all components to provide comprehensive rate limiting functionality.
 """
 
+import os
 import time
-import uuid
 import logging
-from typing import Callable, Dict, Any
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple, Iterable
 from datetime import datetime
 
-from fastapi import Request, Response
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from ..core.models import APIKeyError
-from ..core.redis_client import redis_client
 from ..services.user_service import api_key_validator
+from ..services.api_key_validation import api_key_preview
+from ..services.user_service import security_rate_limiter as shared_security_rate_limiter
 from ..services.security_rate_limiting import SecurityRateLimiter
 from ..services.rate_limit_service import rate_limit_service
 
 logger = logging.getLogger(__name__)
 
+# Request headers the middleware reads (ASGI header names are always lowercase)
+_WANTED_HEADERS = frozenset({
+    b"x-api-key",
+    b"x-forwarded-for",
+    b"x-real-ip",
+    b"user-agent",
+    b"content-type"
+})
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+# Pre-generated request IDs, refilled in batches from a single urandom call
+_REQUEST_ID_BATCH_SIZE = 1024
+_request_ids: deque = deque()
+
+
+def _next_request_id() -> str:
+    """
+    Get a unique request ID for tracing.
+    
+    IDs are 16 hex characters drawn from a pool that is refilled with one
+    os.urandom() call per batch, so the syscall cost is amortized across
+    many requests.
+    
+    Returns:
+        Request identifier
+    """
+    try:
+        return _request_ids.popleft()
+    except IndexError:
+        buf = os.urandom(8 * _REQUEST_ID_BATCH_SIZE)
+        _request_ids.extend(buf[i:i + 8].hex() for i in range(8, len(buf), 8))
+        return buf[:8].hex()
+
+
+def _pluck_headers(raw_headers: Iterable[Tuple[bytes, bytes]]) -> Dict[bytes, bytes]:
+    """
+    Collect the headers the middleware needs in a single pass.
+    
+    Args:
+        raw_headers: Raw ASGI header pairs from the connection scope
+        
+    Returns:
+        Dictionary of wanted header names to raw values
+    """
+    plucked = {}
+    for name, value in raw_headers:
+        # First occurrence wins, matching Starlette's Headers.get()
+        if name in _WANTED_HEADERS and name not in plucked:
+            plucked[name] = value
+    return plucked
+
+
+class RateLimitMiddleware:
     """
     FastAPI middleware for distributed rate limiting with dynamic health awareness.
     
+    Implemented as a pure ASGI middleware so requests are not wrapped in the
+    task group and response streams that BaseHTTPMiddleware adds.
+    
     This middleware:
     1. Validates API keys and resolves user tiers
     2. Checks system health status
@@ -36,7 +90,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     5. Returns appropriate HTTP responses with headers
     """
     
-    def __init__(self, app, 
+    def __init__(self, app: ASGIApp, 
                  exclude_paths: list = None,
                  security_rate_limiter: SecurityRateLimiter = None):
         """
@@ -47,7 +101,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             exclude_paths: List of paths to exclude from rate limiting
             security_rate_limiter: Security rate limiter instance
         """
-        super().__init__(app)
+        self.app = app
         self.exclude_paths = exclude_paths or [
             "/health",
             "/admin",
@@ -55,74 +109,83 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             "/redoc", 
             "/openapi.json"
         ]
-        self.security_rate_limiter = security_rate_limiter or SecurityRateLimiter(redis_client)
+        self.security_rate_limiter = security_rate_limiter or shared_security_rate_limiter
+        self._exact_exclude, self._prefix_exclude = self._compile_exclude_paths(self.exclude_paths)
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Main middleware processing logic.
         
         Args:
-            request: FastAPI request object
-            call_next: Next middleware/handler in chain
-            
-        Returns:
-            HTTP response
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        # Skip excluded paths (health probes, docs) before doing any other work
+        path = scope["path"]
+        if self._should_exclude_path(path):
+            await self.app(scope, receive, send)
+            return
+        
         # Generate unique request ID for tracing
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
+        request_id = _next_request_id()
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
         
-        start_time = time.time()
+        start_time = time.monotonic()
+        method = scope["method"]
+        headers = _pluck_headers(scope["headers"])
+        user_agent = headers.get(b"user-agent", b"").decode("latin-1")
         
-        # Log incoming request
-        logger.info(
-            f"[{request_id}] Incoming request: {request.method} {request.url.path}",
-            extra={
-                "request_id": request_id,
-                "method": request.method,
-                "path": request.url.path,
-                "query_params": str(request.query_params),
-                "user_agent": request.headers.get("User-Agent", ""),
-                "content_type": request.headers.get("Content-Type", ""),
-                "lifecycle_stage": "request_start"
-            }
-        )
+        # Log levels are checked once per request; disabled messages and
+        # their extra dicts are never built
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        info_enabled = logger.isEnabledFor(logging.INFO)
         
-        # Skip rate limiting for excluded paths
-        if self._should_exclude_path(request.url.path):
-            logger.debug(
-                f"[{request_id}] Skipping rate limiting for excluded path: {request.url.path}",
+        # Log incoming request
+        if info_enabled:
+            logger.info(
+                f"[{request_id}] Incoming request: {method} {path}",
                 extra={
                     "request_id": request_id,
-                    "path": request.url.path,
-                    "lifecycle_stage": "path_excluded"
+                    "method": method,
+                    "path": path,
+                    "query_params": scope.get("query_string", b"").decode("latin-1"),
+                    "user_agent": user_agent,
+                    "content_type": headers.get(b"content-type", b"").decode("latin-1"),
+                    "lifecycle_stage": "request_start"
                 }
             )
-            return await call_next(request)
+        
+        response_started = False
         
         try:
             # Extract client information
-            client_ip = self._get_client_ip(request)
-            user_agent = request.headers.get("User-Agent", "")
+            client_ip = self._get_client_ip(headers, scope)
             
             # Create request context for logging
             request_context = {
                 "ip_address": client_ip,
                 "user_agent": user_agent,
                 "request_id": request_id,
-                "path": request.url.path,
-                "method": request.method
+                "path": path,
+                "method": method
             }
             
-            logger.debug(
-                f"[{request_id}] Client info extracted - IP: {client_ip}",
-                extra={
-                    "request_id": request_id,
-                    "client_ip": client_ip,
-                    "user_agent": user_agent,
-                    "lifecycle_stage": "client_info_extracted"
-                }
-            )
+            if debug_enabled:
+                logger.debug(
+                    f"[{request_id}] Client info extracted - IP: {client_ip}",
+                    extra={
+                        "request_id": request_id,
+                        "client_ip": client_ip,
+                        "user_agent": user_agent,
+                        "lifecycle_stage": "client_info_extracted"
+                    }
+                )
             
             # Check if IP is blocked for security violations
             if await self.security_rate_limiter.is_ip_blocked(client_ip):
@@ -134,81 +197,91 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                         "lifecycle_stage": "ip_blocked"
                     }
                 )
-                return self._create_blocked_ip_response(request_id)
+                response = self._create_blocked_ip_response(request_id)
+                await response(scope, receive, send)
+                return
             
             # Validate API key and get user information
-            api_key = request.headers.get("X-API-Key")
-            api_key_preview = api_key[:10] + "..." if api_key and len(api_key) > 10 else "None"
-            
-            logger.debug(
-                f"[{request_id}] Validating API key: {api_key_preview}",
-                extra={
-                    "request_id": request_id,
-                    "api_key_preview": api_key_preview,
-                    "has_api_key": bool(api_key),
-                    "lifecycle_stage": "api_key_validation_start"
-                }
-            )
+            raw_api_key = headers.get(b"x-api-key")
+            api_key = raw_api_key.decode("latin-1") if raw_api_key is not None else None
             
-            try:
-                user_id, tier = api_key_validator.validate_api_key(api_key, request_context)
-                logger.info(
-                    f"[{request_id}] API key validated successfully - User: {user_id}, Tier: {tier}",
+            if debug_enabled:
+                preview = api_key_preview(api_key)
+                logger.debug(
+                    f"[{request_id}] Validating API key: {preview}",
                     extra={
                         "request_id": request_id,
-                        "user_id": user_id,
-                        "tier": tier,
-                        "api_key_preview": api_key_preview,
-                        "lifecycle_stage": "api_key_validated"
+                        "api_key_preview": preview,
+                        "has_api_key": bool(api_key),
+                        "lifecycle_stage": "api_key_validation_start"
                     }
                 )
+            
+            try:
+                user_id, tier = api_key_validator.validate_api_key(api_key, request_context)
+                if info_enabled:
+                    logger.info(
+                        f"[{request_id}] API key validated successfully - User: {user_id}, Tier: {tier}",
+                        extra={
+                            "request_id": request_id,
+                            "user_id": user_id,
+                            "tier": tier,
+                            "api_key_preview": api_key_preview(api_key),
+                            "lifecycle_stage": "api_key_validated"
+                        }
+                    )
             except APIKeyError as e:
                 logger.warning(
                     f"[{request_id}] API key validation failed: {e.message}",
                     extra={
                         "request_id": request_id,
-                        "api_key_preview": api_key_preview,
+                        "api_key_preview": api_key_preview(api_key),
                         "error_code": e.error_code,
                         "error_message": e.message,
                         "client_ip": client_ip,
                         "lifecycle_stage": "api_key_validation_failed"
                     }
                 )
-                return await self._handle_invalid_api_key(e, client_ip, request_context)
+                response = await self._handle_invalid_api_key(e, client_ip, request_context)
+                await response(scope, receive, send)
+                return
             
             # Perform rate limiting check
-            logger.debug(
-                f"[{request_id}] Starting rate limit check for user {user_id} (tier: {tier})",
-                extra={
-                    "request_id": request_id,
-                    "user_id": user_id,
-                    "tier": tier,
-                    "lifecycle_stage": "rate_limit_check_start"
-                }
-            )
+            if debug_enabled:
+                logger.debug(
+                    f"[{request_id}] Starting rate limit check for user {user_id} (tier: {tier})",
+                    extra={
+                        "request_id": request_id,
+                        "user_id": user_id,
+                        "tier": tier,
+                        "lifecycle_stage": "rate_limit_check_start"
+                    }
+                )
             
             rate_limit_result = await rate_limit_service.check_rate_limit(user_id, tier)
             
-            logger.debug(
-                f"[{request_id}] Rate limit check completed - Allowed: {rate_limit_result.allowed}, "
-                f"Remaining: {rate_limit_result.remaining}/{rate_limit_result.limit}",
-                extra={
-                    "request_id": request_id,
-                    "user_id": user_id,
-                    "tier": tier,
-                    "allowed": rate_limit_result.allowed,
-                    "remaining": rate_limit_result.remaining,
-                    "limit": rate_limit_result.limit,
-                    "reset_time": rate_limit_result.reset_time,
-                    "lifecycle_stage": "rate_limit_check_completed"
-                }
-            )
+            if debug_enabled:
+                logger.debug(
+                    f"[{request_id}] Rate limit check completed - Allowed: {rate_limit_result.allowed}, "
+                    f"Remaining: {rate_limit_result.remaining}/{rate_limit_result.limit}",
+                    extra={
+                        "request_id": request_id,
+                        "user_id": user_id,
+                        "tier": tier,
+                        "allowed": rate_limit_result.allowed,
+                        "remaining": rate_limit_result.remaining,
+                        "limit": rate_limit_result.limit,
+                        "reset_time": rate_limit_result.reset_time,
+                        "lifecycle_stage": "rate_limit_check_completed"
+                    }
+                )
             
             if not rate_limit_result.allowed:
-                # Rate limit exceeded
+                # Rate limit exceeded; read the clock once for the log and response
+                reset_in = rate_limit_result.reset_time - int(time.time())
                 logger.warning(
                     f"[{request_id}] Rate limit exceeded for user {user_id} (tier: {tier}) - "
-                    f"Limit: {rate_limit_result.limit}, Reset in: {rate_limit_result.reset_time - int(time.time())}s",
+                    f"Limit: {rate_limit_result.limit}, Reset in: {reset_in}s",
                     extra={
                         "request_id": request_id,
                         "rate_limit_violation": True,
@@ -221,63 +294,73 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     }
                 )
                 
-                response = self._create_rate_limited_response(rate_limit_result, request_id)
-                return response
+                response = self._create_rate_limited_response(rate_limit_result, request_id, reset_in)
+                await response(scope, receive, send)
+                return
             
             # Rate limit check passed, process the request
-            logger.debug(
-                f"[{request_id}] Rate limit check passed, forwarding request to handler",
-                extra={
-                    "request_id": request_id,
-                    "user_id": user_id,
-                    "tier": tier,
-                    "remaining": rate_limit_result.remaining,
-                    "lifecycle_stage": "forwarding_to_handler"
-                }
-            )
+            if debug_enabled:
+                logger.debug(
+                    f"[{request_id}] Rate limit check passed, forwarding request to handler",
+                    extra={
+                        "request_id": request_id,
+                        "user_id": user_id,
+                        "tier": tier,
+                        "remaining": rate_limit_result.remaining,
+                        "lifecycle_stage": "forwarding_to_handler"
+                    }
+                )
             
             # Store rate limit info in request state for endpoints to access
-            request.state.rate_limit_result = rate_limit_result
-            request.state.user_id = user_id
-            request.state.tier = tier
+            state["rate_limit_result"] = rate_limit_result
+            state["user_id"] = user_id
+            state["tier"] = tier
             
-            # Process the request
-            response = await call_next(request)
+            # Rate limiting and request ID headers for the successful response
+            extra_headers = self._rate_limit_headers(rate_limit_result, request_id)
+            status_code = 500
+            response_size = 0
             
-            # Add rate limiting headers to successful responses
-            self._add_rate_limit_headers(response, rate_limit_result)
+            async def send_wrapper(message: Message) -> None:
+                nonlocal response_started, status_code, response_size
+                if message["type"] == "http.response.start":
+                    response_started = True
+                    status_code = message["status"]
+                    message["headers"] = [*message.get("headers", ()), *extra_headers]
+                elif message["type"] == "http.response.body":
+                    response_size += len(message.get("body", b""))
+                await send(message)
             
-            # Add request ID header
-            response.headers["X-Request-ID"] = request_id
+            # Process the request
+            await self.app(scope, receive, send_wrapper)
             
             # Log successful request completion
-            duration = time.time() - start_time
-            logger.info(
-                f"[{request_id}] Request completed successfully for user {user_id} (tier: {tier}) - "
-                f"Duration: {duration:.3f}s, Status: {response.status_code}, Remaining: {rate_limit_result.remaining}",
-                extra={
-                    "request_id": request_id,
-                    "user_id": user_id,
-                    "tier": tier,
-                    "remaining": rate_limit_result.remaining,
-                    "duration": duration,
-                    "status_code": response.status_code,
-                    "response_size": len(response.body) if hasattr(response, 'body') else 0,
-                    "lifecycle_stage": "request_completed"
-                }
-            )
-            
-            return response
+            duration = time.monotonic() - start_time
+            if info_enabled:
+                logger.info(
+                    f"[{request_id}] Request completed successfully for user {user_id} (tier: {tier}) - "
+                    f"Duration: {duration:.3f}s, Status: {status_code}, Remaining: {rate_limit_result.remaining}",
+                    extra={
+                        "request_id": request_id,
+                        "user_id": user_id,
+                        "tier": tier,
+                        "remaining": rate_limit_result.remaining,
+                        "duration": duration,
+                        "status_code": status_code,
+                        "response_size": response_size,
+                        "lifecycle_stage": "request_completed"
+                    }
+                )
             
         except Exception as e:
             # Handle unexpected errors
-            duration = time.time() - start_time
+            duration = time.monotonic() - start_time
             logger.error(
                 f"[{request_id}] Unexpected error in rate limiting middleware: {type(e).__name__}: {e}",
                 extra={
                     "request_id": request_id,
-                    "path": request.url.path,
-                    "method": request.method,
+                    "path": path,
+                    "method": method,
                     "error_type": type(e).__name__,
                     "error_message": str(e),
                     "duration": duration,
@@ -286,8 +369,12 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 exc_info=True
             )
             
+            # The response is already on the wire, nothing more can be sent
+            if response_started:
+                raise
+            
             # Return 500 error
-            return JSONResponse(
+            response = JSONResponse(
                 content={
                     "error": "Internal server error",
                     "message": "An unexpected error occurred while processing your request",
@@ -296,6 +383,33 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 status_code=500,
                 headers={"X-Request-ID": request_id}
             )
+            await response(scope, receive, send)
+    
+    @staticmethod
+    def _compile_exclude_paths(exclude_paths: list) -> Tuple[frozenset, Tuple[str, ...]]:
+        """
+        Precompile excluded paths into exact-match and prefix lookups.
+        
+        Args:
+            exclude_paths: List of paths to exclude; entries ending in /*
+                also exclude everything below them
+            
+        Returns:
+            Tuple of (exact normalized paths, prefixes for directory matches)
+        """
+        exact = set()
+        prefixes = []
+        for excluded in exclude_paths:
+            # Normalize excluded path (remove trailing slash except for root)
+            exact.add(excluded.rstrip('/') or '/')
+            
+            # Prefix match for directories (excluded path ends with /*)
+            if excluded.endswith('/*'):
+                normalized_prefix = excluded[:-2].rstrip('/') or '/'
+                exact.add(normalized_prefix)
+                prefixes.append(normalized_prefix + '/')
+        
+        return frozenset(exact), tuple(prefixes)
     
     def _should_exclude_path(self, path: str) -> bool:
         """
@@ -307,48 +421,37 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         Returns:
             True if path should be excluded
         """
+        if path in self._exact_exclude:
+            return True
+        
         # Normalize path (remove trailing slash except for root)
         normalized_path = path.rstrip('/') or '/'
-        
-        for excluded in self.exclude_paths:
-            # Normalize excluded path
-            normalized_excluded = excluded.rstrip('/') or '/'
-            
-            # Exact match
-            if normalized_path == normalized_excluded:
-                return True
-                
-            # Prefix match for directories (excluded path ends with /*)
-            if excluded.endswith('/*'):
-                prefix = excluded[:-2]  # Remove /*
-                normalized_prefix = prefix.rstrip('/') or '/'
-                if normalized_path.startswith(normalized_prefix + '/') or normalized_path == normalized_prefix:
-                    return True
-        
-        return False
+        return normalized_path in self._exact_exclude or normalized_path.startswith(self._prefix_exclude)
     
-    def _get_client_ip(self, request: Request) -> str:
+    def _get_client_ip(self, headers: Dict[bytes, bytes], scope: Scope) -> str:
         """
         Extract client IP address from request.
         
         Args:
-            request: FastAPI request object
+            headers: Plucked request headers
+            scope: ASGI connection scope
             
         Returns:
             Client IP address
         """
         # Check for forwarded headers (when behind a proxy/load balancer)
-        forwarded_for = request.headers.get("X-Forwarded-For")
+        forwarded_for = headers.get(b"x-forwarded-for")
         if forwarded_for:
             # X-Forwarded-For can contain multiple IPs, take the first one
-            return forwarded_for.split(",")[0].strip()
+            return forwarded_for.split(b",", 1)[0].strip().decode("latin-1")
         
-        real_ip = request.headers.get("X-Real-IP")
+        real_ip = headers.get(b"x-real-ip")
         if real_ip:
-            return real_ip
+            return real_ip.decode("latin-1")
         
         # Fallback to direct client IP
-        return request.client.host if request.client else "unknown"
+        client = scope.get("client")
+        return client[0] if client else "unknown"
     
     async def _handle_invalid_api_key(self, error: APIKeyError, client_ip: str,
                                      request_context: Dict[str, Any]) -> JSONResponse:
@@ -375,9 +478,11 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             }
         )
         
-        # Check rate limit for invalid key attempts
-        if not await self.security_rate_limiter.check_invalid_key_attempts(client_ip):
-            # Too many invalid attempts, block the IP
+        # Check rate limit for invalid key attempts; the IP is blocked as
+        # part of the same check once the limit is exceeded
+        if not await self.security_rate_limiter.check_invalid_key_attempts(
+            client_ip, block_minutes=15
+        ):
             logger.warning(
                 f"[{request_id}] IP {client_ip} blocked due to too many invalid API key attempts",
                 extra={
@@ -389,8 +494,6 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 }
             )
             
-            await self.security_rate_limiter.block_ip(client_ip, duration_minutes=15)
-            
             return JSONResponse(
                 content={
                     "error": "Too many invalid API key attempts. IP temporarily blocked.",
@@ -451,50 +554,60 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             }
         )
     
-    def _create_rate_limited_response(self, rate_limit_result, request_id: str) -> JSONResponse:
+    def _create_rate_limited_response(self, rate_limit_result, request_id: str,
+                                      reset_in: Optional[int] = None) -> JSONResponse:
         """
         Create response for rate limited requests.
         
         Args:
             rate_limit_result: Rate limit result object
             request_id: Request identifier
+            reset_in: Seconds until the window resets, if already computed
             
         Returns:
             JSON response for rate limited request
         """
-        retry_after = rate_limit_result.reset_time - int(time.time())
-        retry_after = max(1, retry_after)  # At least 1 second
+        if reset_in is None:
+            reset_in = rate_limit_result.reset_time - int(time.time())
+        retry_after = max(1, reset_in)  # At least 1 second
+        limit_str, limit_message = rate_limit_service.get_limit_strings(rate_limit_result.limit)
         
         return JSONResponse(
             content={
                 "error": "Rate limit exceeded",
                 "error_code": "RATE_LIMIT_EXCEEDED",
-                "message": f"You have exceeded the rate limit of {rate_limit_result.limit} requests per minute.",
+                "message": limit_message,
                 "retry_after": retry_after,
                 "request_id": request_id
             },
             status_code=429,
             headers={
                 "X-Request-ID": request_id,
-                "X-RateLimit-Limit": str(rate_limit_result.limit),
+                "X-RateLimit-Limit": limit_str,
                 "X-RateLimit-Remaining": "0",
                 "X-RateLimit-Reset": str(rate_limit_result.reset_time),
                 "Retry-After": str(retry_after)
             }
         )
     
-    def _add_rate_limit_headers(self, response: Response, rate_limit_result) -> None:
+    def _rate_limit_headers(self, rate_limit_result, request_id: str) -> List[Tuple[bytes, bytes]]:
         """
-        Add rate limiting headers to successful responses.
+        Build rate limiting headers for successful responses.
         
         Args:
-            response: HTTP response object
             rate_limit_result: Rate limit result object
+            request_id: Request identifier
+            
+        Returns:
+            Raw ASGI header pairs to append to the response
         """
-        response.headers["X-RateLimit-Limit"] = str(rate_limit_result.limit)
-        response.headers["X-RateLimit-Remaining"] = str(rate_limit_result.remaining)
-        response.headers["X-RateLimit-Reset"] = str(rate_limit_result.reset_time)
-
+        limit_str = rate_limit_service.get_limit_strings(rate_limit_result.limit)[0]
+        return [
+            (b"x-ratelimit-limit", limit_str.encode("latin-1")),
+            (b"x-ratelimit-remaining", str(rate_limit_result.remaining).encode("latin-1")),
+            (b"x-ratelimit-reset", str(rate_limit_result.reset_time).encode("latin-1")),
+            (b"x-request-id", request_id.encode("latin-1"))
+        ]
 
 def create_rate_limit_middleware(exclude_paths: list = None) -> RateLimitMiddleware:
     """
@@ -5,15 +5,36 @@ This module provides services for validating API keys and handling security even
 with comprehensive error handling and security features.
 """
 
+import re
 import logging
 from typing import Optional, Tuple, Dict, Any
 from datetime import datetime
 
-from ..core.models import APIKeyError, SecurityEvent
+from ..core.models import APIKeyError
 from .user_management import UserTierManager
 
 logger = logging.getLogger(__name__)
 
+# Well-formed API key: 10-200 alphanumeric, underscore or hyphen characters
+_API_KEY_PATTERN = re.compile(r"[A-Za-z0-9_-]{10,200}")
+
+
+def api_key_preview(api_key: Optional[str]) -> str:
+    """
+    Shorten an API key for log output.
+    
+    Args:
+        api_key: API key to shorten, if any
+        
+    Returns:
+        The first 10 characters of longer keys followed by "...", a fixed
+        mask for keys of 10 characters or fewer, or "None" if there is no key
+    """
+    if not api_key:
+        return "None"
+    # A short key would be printed in full, so mask it entirely
+    return api_key[:10] + "..." if len(api_key) > 10 else "***"
+
 
 class APIKeyValidator:
     """Validates API keys and handles security events."""
@@ -40,16 +61,8 @@ class APIKeyValidator:
         if not api_key:
             return False
         
-        # Basic format validation
-        if len(api_key) < 10 or len(api_key) > 200:
-            return False
-        
-        # Check for reasonable characters (alphanumeric, underscore, hyphen)
-        allowed_chars = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-")
-        if not all(c in allowed_chars for c in api_key):
-            return False
-        
-        return True
+        # Length and character checks in a single C-level scan
+        return _API_KEY_PATTERN.fullmatch(api_key) is not None
     
     def validate_api_key(self, api_key: Optional[str], request_context: Dict[str, Any]) -> Tuple[str, str]:
         """
@@ -67,16 +80,19 @@ class APIKeyValidator:
         """
         request_id = request_context.get("request_id", "unknown")
         client_ip = request_context.get("ip_address", "unknown")
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        info_enabled = logger.isEnabledFor(logging.INFO)
         
-        logger.debug(
-            f"[{request_id}] Starting API key validation",
-            extra={
-                "request_id": request_id,
-                "client_ip": client_ip,
-                "has_api_key": bool(api_key),
-                "user_service_operation": "api_key_validation_start"
-            }
-        )
+        if debug_enabled:
+            logger.debug(
+                f"[{request_id}] Starting API key validation",
+                extra={
+                    "request_id": request_id,
+                    "client_ip": client_ip,
+                    "has_api_key": bool(api_key),
+                    "user_service_operation": "api_key_validation_start"
+                }
+            )
         
         # Check if API key is provided
         if api_key is None:
@@ -125,26 +141,32 @@ class APIKeyValidator:
                 error_code="EMPTY_API_KEY"
             )
         
-        api_key_preview = api_key[:10] + "..." if len(api_key) > 10 else api_key
+        # The preview only feeds log output, so skip building it when the
+        # messages that use it are filtered out
+        if info_enabled:
+            preview = api_key_preview(api_key)
         
         # Validate format
-        logger.debug(
-            f"[{request_id}] Validating API key format: {api_key_preview}",
-            extra={
-                "request_id": request_id,
-                "api_key_preview": api_key_preview,
-                "api_key_length": len(api_key),
-                "user_service_operation": "api_key_format_validation"
-            }
-        )
+        if debug_enabled:
+            logger.debug(
+                f"[{request_id}] Validating API key format: {preview}",
+                extra={
+                    "request_id": request_id,
+                    "api_key_preview": preview,
+                    "api_key_length": len(api_key),
+                    "user_service_operation": "api_key_format_validation"
+                }
+            )
         
         if not self._is_valid_format(api_key):
+            # First 20 chars, shared by the log line and the security event
+            api_key_prefix = api_key[:20]
             logger.warning(
-                f"[{request_id}] Malformed API key format from {client_ip}: {api_key[:20]}",
+                f"[{request_id}] Malformed API key format from {client_ip}: {api_key_prefix}",
                 extra={
                     "request_id": request_id,
                     "client_ip": client_ip,
-                    "api_key_preview": api_key[:20],
+                    "api_key_preview": api_key_prefix,
                     "api_key_length": len(api_key),
                     "error_code": "MALFORMED_API_KEY",
                     "user_service_operation": "api_key_format_invalid"
@@ -152,7 +174,7 @@ class APIKeyValidator:
             )
             
             self._log_security_event(
-                api_key=api_key[:20],  # Log first 20 chars for debugging
+                api_key=api_key_prefix,
                 error_code="MALFORMED_API_KEY",
                 request_context=request_context
             )
@@ -163,30 +185,33 @@ class APIKeyValidator:
             )
         
         # Look up user and tier
-        logger.debug(
-            f"[{request_id}] Looking up user and tier for API key: {api_key_preview}",
-            extra={
-                "request_id": request_id,
-                "api_key_preview": api_key_preview,
-                "user_service_operation": "api_key_lookup_start"
-            }
-        )
+        if debug_enabled:
+            logger.debug(
+                f"[{request_id}] Looking up user and tier for API key: {preview}",
+                extra={
+                    "request_id": request_id,
+                    "api_key_preview": preview,
+                    "user_service_operation": "api_key_lookup_start"
+                }
+            )
         
         user_tier_info = self.user_manager.get_user_tier(api_key)
         if not user_tier_info:
+            # First 20 chars, shared by the log line and the security event
+            api_key_prefix = api_key[:20]
             logger.warning(
-                f"[{request_id}] Invalid API key from {client_ip}: {api_key[:20]}",
+                f"[{request_id}] Invalid API key from {client_ip}: {api_key_prefix}",
                 extra={
                     "request_id": request_id,
                     "client_ip": client_ip,
-                    "api_key_preview": api_key[:20],
+                    "api_key_preview": api_key_prefix,
                     "error_code": "INVALID_API_KEY",
                     "user_service_operation": "api_key_lookup_failed"
                 }
             )
             
             self._log_security_event(
-                api_key=api_key[:20],  # Log first 20 chars for debugging
+                api_key=api_key_prefix,
                 error_code="INVALID_API_KEY",
                 request_context=request_context
             )
@@ -198,18 +223,20 @@ class APIKeyValidator:
         
         user_id, tier = user_tier_info
         
-        logger.info(
-            f"[{request_id}] API key validation successful: {api_key_preview} -> {user_id} ({tier})",
-            extra={
-                "request_id": request_id,
-                "client_ip": client_ip,
-                "api_key_preview": api_key_preview,
-                "user_id": user_id,
-                "tier": tier,
-                "user_service_operation": "api_key_validation_success"
-            }
-        )
-        logger.debug(f"Valid API key for user {user_id} (tier: {tier})")
+        if info_enabled:
+            logger.info(
+                f"[{request_id}] API key validation successful: {preview} -> {user_id} ({tier})",
+                extra={
+                    "request_id": request_id,
+                    "client_ip": client_ip,
+                    "api_key_preview": preview,
+                    "user_id": user_id,
+                    "tier": tier,
+                    "user_service_operation": "api_key_validation_success"
+                }
+            )
+            if debug_enabled:
+                logger.debug(f"Valid API key for user {user_id} (tier: {tier})")
         return user_id, tier
     
     def _log_security_event(self, api_key: str, error_code: str, 
@@ -222,20 +249,27 @@ class APIKeyValidator:
             error_code: Error code
             request_context: Request context information
         """
-        event = SecurityEvent(
-            event_type="api_key_validation_failed",
-            api_key_prefix=api_key[:8] + "..." if len(api_key) > 8 else api_key,
-            ip_address=request_context.get("ip_address", "unknown"),
-            user_agent=request_context.get("user_agent", "unknown"),
-            error_code=error_code,
-            request_id=request_context.get("request_id")
-        )
+        if not logger.isEnabledFor(logging.WARNING):
+            return
+        
+        # Same fields as the SecurityEvent model, built as a plain dict:
+        # attackers control how often this runs, and validating a model per
+        # attempt costs over ten times as much
+        event = {
+            "event_type": "api_key_validation_failed",
+            "api_key_prefix": api_key[:8] + "..." if len(api_key) > 8 else api_key,
+            "ip_address": request_context.get("ip_address", "unknown"),
+            "user_agent": request_context.get("user_agent", "unknown"),
+            "error_code": error_code,
+            "timestamp": datetime.utcnow(),
+            "request_id": request_context.get("request_id")
+        }
         
         # Log as structured data
         logger.warning(
             "Invalid API key attempt",
             extra={
-                "event": event.dict(),
+                "event": event,
                 "security_alert": True
             }
         )
@@ -8,7 +8,7 @@ component health checks.
 import time
 import logging
 from typing import Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 
 from ..core.models import SystemHealth
 from ..core.config import config_manager
@@ -23,6 +23,10 @@ class HealthService:
     def __init__(self):
         """Initialize health service."""
         self.redis_client = redis_client
+        # (epoch second, formatted string) of the last conversion; timestamps
+        # change rarely, so repeat calls skip datetime formatting
+        self._readable_ts_cache = (0, "")
+        self._utc_now_cache = (0, "")
     
     async def get_system_health(self) -> Dict[str, Any]:
         """
@@ -33,13 +37,7 @@ class HealthService:
         """
         try:
             health_data = await self.redis_client.get_system_health()
-            
-            # Convert timestamp to readable format
-            if "timestamp" in health_data:
-                timestamp = int(health_data["timestamp"])
-                health_data["last_updated_readable"] = datetime.fromtimestamp(timestamp).isoformat()
-            
-            return health_data
+            return self._add_readable_timestamp(health_data)
             
         except Exception as e:
             logger.error(f"Failed to get system health: {e}")
@@ -49,6 +47,37 @@ class HealthService:
                 "error": str(e)
             }
     
+    def _add_readable_timestamp(self, health_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add a human readable form of the health timestamp.
+        
+        Args:
+            health_data: Health status dictionary from Redis
+            
+        Returns:
+            The same dictionary with last_updated_readable set
+        """
+        if "timestamp" in health_data:
+            timestamp = int(health_data["timestamp"])
+            if timestamp != self._readable_ts_cache[0]:
+                self._readable_ts_cache = (timestamp, datetime.fromtimestamp(timestamp).isoformat())
+            health_data["last_updated_readable"] = self._readable_ts_cache[1]
+        
+        return health_data
+    
+    def _utc_now_isoformat(self) -> str:
+        """
+        Get the current UTC time as an ISO 8601 string, to the second.
+        
+        Returns:
+            Naive UTC ISO timestamp, reformatted at most once per second
+        """
+        now = int(time.time())
+        if now != self._utc_now_cache[0]:
+            utc_now = datetime.fromtimestamp(now, timezone.utc).replace(tzinfo=None)
+            self._utc_now_cache = (now, utc_now.isoformat())
+        return self._utc_now_cache[1]
+    
     async def set_system_health(self, status: str, ttl_seconds: Optional[int] = None,
                                updated_by: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -99,14 +128,17 @@ class HealthService:
         health_checks = {}
         overall_healthy = True
         
-        # Check Redis connectivity
+        # Ping Redis and read the health status in a single pipelined round-trip;
+        # if it fails Redis is down, so don't probe it again
         try:
-            redis_healthy = await self.redis_client.is_healthy()
-            health_checks["redis"] = "healthy" if redis_healthy else "unhealthy"
-            if not redis_healthy:
-                overall_healthy = False
+            redis_healthy, system_health_data = await self.redis_client.ping_and_get_system_health()
         except Exception as e:
-            health_checks["redis"] = f"error: {e}"
+            logger.debug(f"Health probe failed, reporting Redis as unhealthy: {e}")
+            redis_healthy = False
+            system_health_data = {"status": SystemHealth.NORMAL}
+        
+        health_checks["redis"] = "healthy" if redis_healthy else "unhealthy"
+        if not redis_healthy:
             overall_healthy = False
         
         # Check configuration
@@ -117,15 +149,11 @@ class HealthService:
             health_checks["config"] = f"error: {e}"
             overall_healthy = False
         
-        # Get current system health status
-        try:
-            system_health_data = await self.get_system_health()
-            health_checks["system_health"] = system_health_data.get("status", "unknown")
-        except Exception as e:
-            health_checks["system_health"] = f"error: {e}"
+        # Current system health status, NORMAL if Redis could not be read
+        health_checks["system_health"] = system_health_data.get("status", "unknown")
         
         return {
             "overall_status": "healthy" if overall_healthy else "unhealthy",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": self._utc_now_isoformat(),
             "components": health_checks
         }
@@ -7,7 +7,8 @@ dynamic limits based on system health status and user tiers.
 
 import time
 import logging
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
 
 from ..core.models import RateLimitResult, SystemHealth, TierConfig
 from ..core.config import config_manager
@@ -15,6 +16,9 @@ from ..core.redis_client import redis_client
 
 logger = logging.getLogger(__name__)
 
+# Row index of each health state in a tier's limit table entry
+_HEALTH_INDEX: Dict[str, int] = {SystemHealth.NORMAL: 0, SystemHealth.DEGRADED: 1}
+
 
 class RateLimitService:
     """Core rate limiting service with dynamic health-aware limiting."""
@@ -22,9 +26,32 @@ class RateLimitService:
     def __init__(self):
         """Initialize rate limiting service."""
         self.redis_client = redis_client
-        self._health_cache = {}
-        self._health_cache_ttl = 2 # Cache health status for 2 seconds
-        self._last_health_check = 0
+        # Last system health Redis reported, used by the Redis-down fallback
+        self._health_state: Optional[str] = None
+        self._limit_strings: Dict[int, Tuple[str, str]] = {}
+        # tier -> (tier_config, limits indexed by _HEALTH_INDEX)
+        self._limit_table: Dict[str, Tuple[TierConfig, Tuple[int, int, int]]] = {}
+        # user_id -> (count, window_start) used while Redis is unreachable
+        self._local_windows: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        self._local_windows_max = 100_000
+    
+    async def preload_rate_limit_scripts(self) -> None:
+        """Load the rate limit scripts for the configured tiers into Redis."""
+        # Load each tier's rate limit script so first requests skip NOSCRIPT
+        try:
+            await self.redis_client.preload_rate_limit_scripts(
+                (self._get_tier_limits(tier, tier_config), tier_config.window_seconds)
+                for tier, tier_config in config_manager.config.tiers.items()
+            )
+        except Exception as e:
+            logger.warning(
+                f"Could not preload rate limit scripts: {type(e).__name__}: {e}",
+                extra={
+                    "error_type": type(e).__name__,
+                    "error_message": str(e),
+                    "service_operation": "script_preload_failed"
+                }
+            )
     
     async def check_rate_limit(self, user_id: str, tier: str) -> RateLimitResult:
         """
@@ -37,97 +64,44 @@ class RateLimitService:
         Returns:
             RateLimitResult with decision and metadata
         """
-        logger.debug(
-            f"Starting rate limit check for user {user_id} with tier {tier}",
-            extra={
-                "user_id": user_id,
-                "tier": tier,
-                "service_operation": "check_rate_limit_start"
-            }
-        )
-        
-        # Get tier configuration
-        tier_config = config_manager.get_tier_config(tier)
-        if not tier_config:
-            logger.error(
-                f"No configuration found for tier: {tier} - using fallback limits",
-                extra={
-                    "user_id": user_id,
-                    "tier": tier,
-                    "error": "tier_config_not_found",
-                    "service_operation": "tier_config_fallback"
-                }
-            )
-            # Fallback to minimal limits
-            tier_config = TierConfig(
-                base_limit=10,
-                burst_limit=10,
-                degraded_limit=2,
-                window_minutes=1
-            )
-        else:
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(
-                f"Tier configuration retrieved for {tier}: base={tier_config.base_limit}, "
-                f"burst={tier_config.burst_limit}, degraded={tier_config.degraded_limit}",
+                f"Starting rate limit check for user {user_id} with tier {tier}",
                 extra={
                     "user_id": user_id,
                     "tier": tier,
-                    "tier_config": {
-                        "base_limit": tier_config.base_limit,
-                        "burst_limit": tier_config.burst_limit,
-                        "degraded_limit": tier_config.degraded_limit,
-                        "window_minutes": tier_config.window_minutes
-                    },
-                    "service_operation": "tier_config_loaded"
+                    "service_operation": "check_rate_limit_start"
                 }
             )
         
-        # Get system health and determine effective limit
-        logger.debug(
-            f"Retrieving system health for user {user_id}",
-            extra={
-                "user_id": user_id,
-                "tier": tier,
-                "service_operation": "system_health_check_start"
-            }
-        )
+        tier_config = self._get_tier_config(user_id, tier)
+        limits = self._get_tier_limits(tier, tier_config)
         
-        system_health = await self._get_system_health_cached()
-        effective_limit = self._calculate_effective_limit(tier, tier_config, system_health)
-        
-        logger.info(
-            f"Effective limit calculated for user {user_id}: {effective_limit} (system_health: {system_health})",
-            extra={
-                "user_id": user_id,
-                "tier": tier,
-                "system_health": system_health,
-                "effective_limit": effective_limit,
-                "base_limit": tier_config.base_limit,
-                "burst_limit": tier_config.burst_limit,
-                "degraded_limit": tier_config.degraded_limit,
-                "service_operation": "effective_limit_calculated"
-            }
-        )
-        
-        # Perform rate limit check
+        # Perform rate limit check; the script reads system health and picks
+        # the matching limit itself, so there is no separate health lookup
         try:
-            logger.debug(
-                f"Executing Redis rate limit check for user {user_id} with limit {effective_limit}",
-                extra={
-                    "user_id": user_id,
-                    "tier": tier,
-                    "effective_limit": effective_limit,
-                    "window_minutes": tier_config.window_minutes,
-                    "service_operation": "redis_rate_check_start"
-                }
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Executing Redis rate limit check for user {user_id} with limits {limits}",
+                    extra={
+                        "user_id": user_id,
+                        "tier": tier,
+                        "limits": limits,
+                        "window_minutes": tier_config.window_minutes,
+                        "service_operation": "redis_rate_check_start"
+                    }
+                )
             
-            allowed, current_count, reset_time = await self.redis_client.check_rate_limit(
+            (allowed, current_count, reset_time,
+             system_health, effective_limit) = await self.redis_client.check_rate_limit(
                 user_id=user_id,
-                limit=effective_limit,
-                window_minutes=tier_config.window_minutes
+                limits=limits,
+                window_seconds=tier_config.window_seconds
             )
             
+            # Remember the reported health for the fallback path
+            self._store_health_status(system_health)
+            
             remaining = max(0, effective_limit - current_count)
             
             result = RateLimitResult(
@@ -140,27 +114,33 @@ class RateLimitService:
             )
             
             # Log rate limit decision
-            logger.info(
-                f"Rate limit check completed for user {user_id} (tier: {tier}): "
-                f"allowed={allowed}, count={current_count}/{effective_limit}, remaining={remaining}, "
-                f"system_health={system_health}, reset_in={reset_time - int(time.time())}s",
-                extra={
-                    "user_id": user_id,
-                    "tier": tier,
-                    "allowed": allowed,
-                    "current_count": current_count,
-                    "effective_limit": effective_limit,
-                    "remaining": remaining,
-                    "system_health": system_health,
-                    "reset_time": reset_time,
-                    "reset_in_seconds": reset_time - int(time.time()),
-                    "service_operation": "rate_limit_decision"
-                }
-            )
+            if logger.isEnabledFor(logging.INFO):
+                reset_in = reset_time - int(time.time())
+                logger.info(
+                    f"Rate limit check completed for user {user_id} (tier: {tier}): "
+                    f"allowed={allowed}, count={current_count}/{effective_limit}, remaining={remaining}, "
+                    f"system_health={system_health}, reset_in={reset_in}s",
+                    extra={
+                        "user_id": user_id,
+                        "tier": tier,
+                        "allowed": allowed,
+                        "current_count": current_count,
+                        "effective_limit": effective_limit,
+                        "remaining": remaining,
+                        "system_health": system_health,
+                        "reset_time": reset_time,
+                        "reset_in_seconds": reset_in,
+                        "service_operation": "rate_limit_decision"
+                    }
+                )
             
             return result
             
         except Exception as e:
+            # Redis is unreachable, so use the last health it reported
+            effective_limit = self._calculate_effective_limit(
+                tier, tier_config, self._cached_health_status()
+            )
             logger.error(
                 f"Rate limit check failed for user {user_id}: {type(e).__name__}: {e}",
                 extra={
@@ -171,26 +151,32 @@ class RateLimitService:
                     "error_message": str(e),
                     "service_operation": "rate_limit_check_failed"
                 },
-                exc_info=True
+                exc_info=logger.isEnabledFor(logging.DEBUG)
             )
             
-            # Fallback: allow request but with minimal remaining count
+            # Fallback: keep enforcing the limit with a per-process counter so
+            # a Redis outage doesn't switch rate limiting off
+            allowed, current_count, reset_time = self._check_local_rate_limit(
+                user_id, effective_limit, tier_config.window_seconds
+            )
+            remaining = max(0, effective_limit - current_count)
+            
             fallback_result = RateLimitResult(
-                allowed=True,
-                remaining=1,
-                reset_time=int(time.time()) + (tier_config.window_minutes * 60),
+                allowed=allowed,
+                remaining=remaining,
+                reset_time=reset_time,
                 limit=effective_limit,
                 user_id=user_id,
                 tier=tier
             )
             
             logger.warning(
-                f"Using fallback rate limit result for user {user_id} due to Redis failure",
+                f"Using local fallback rate limit for user {user_id} due to Redis failure",
                 extra={
                     "user_id": user_id,
                     "tier": tier,
-                    "fallback_allowed": True,
-                    "fallback_remaining": 1,
+                    "fallback_allowed": allowed,
+                    "fallback_remaining": remaining,
                     "fallback_limit": effective_limit,
                     "service_operation": "rate_limit_fallback"
                 }
@@ -198,11 +184,225 @@ class RateLimitService:
             
             return fallback_result
     
+    async def check_rate_limit_many(self, requests: List[Tuple[str, str]]) -> List[RateLimitResult]:
+        """
+        Check rate limits for a batch of requests in one Redis round-trip.
+        
+        Args:
+            requests: List of (user_id, tier) tuples
+            
+        Returns:
+            RateLimitResult for each request, in the order given
+        """
+        plans = []
+        for user_id, tier in requests:
+            tier_config = self._get_tier_config(user_id, tier)
+            plans.append((user_id, tier, tier_config))
+        
+        try:
+            outcomes = await self.redis_client.check_rate_limit_many([
+                (user_id, self._get_tier_limits(tier, tier_config), tier_config.window_seconds)
+                for user_id, tier, tier_config in plans
+            ])
+            if outcomes:
+                self._store_health_status(outcomes[-1][3])
+                
+        except Exception as e:
+            logger.error(
+                f"Batch rate limit check failed for {len(plans)} requests: {type(e).__name__}: {e}",
+                extra={
+                    "batch_size": len(plans),
+                    "error_type": type(e).__name__,
+                    "error_message": str(e),
+                    "service_operation": "rate_limit_batch_failed"
+                },
+                exc_info=logger.isEnabledFor(logging.DEBUG)
+            )
+            
+            # Same local fallback as check_rate_limit, applied per request
+            system_health = self._cached_health_status()
+            outcomes = []
+            for user_id, tier, tier_config in plans:
+                effective_limit = self._calculate_effective_limit(tier, tier_config, system_health)
+                outcomes.append((
+                    *self._check_local_rate_limit(user_id, effective_limit, tier_config.window_seconds),
+                    system_health,
+                    effective_limit
+                ))
+        
+        return [
+            RateLimitResult(
+                allowed=allowed,
+                remaining=max(0, effective_limit - current_count),
+                reset_time=reset_time,
+                limit=effective_limit,
+                user_id=user_id,
+                tier=tier
+            )
+            for (user_id, tier, _), (allowed, current_count, reset_time, _, effective_limit)
+            in zip(plans, outcomes)
+        ]
+    
+    def _check_local_rate_limit(self, user_id: str, limit: int, 
+                                window_seconds: int) -> Tuple[bool, int, int]:
+        """
+        Check rate limit against an in-process fixed window counter.
+        
+        Used only when Redis is unavailable. Windows are aligned the same way
+        as in Redis, and least recently seen users are evicted once
+        _local_windows_max users are tracked.
+        
+        Args:
+            user_id: User identifier
+            limit: Request limit for the window
+            window_seconds: Window size in seconds
+            
+        Returns:
+            Tuple of (allowed, current_count, reset_timestamp)
+        """
+        current_time = int(time.time())
+        window_start = current_time - current_time % window_seconds
+        
+        count = 0
+        entry = self._local_windows.get(user_id)
+        if entry is not None:
+            self._local_windows.move_to_end(user_id)
+            if entry[1] == window_start:
+                count = entry[0]
+        
+        allowed = count < limit
+        if allowed:
+            count += 1
+        
+        self._local_windows[user_id] = (count, window_start)
+        if len(self._local_windows) > self._local_windows_max:
+            self._local_windows.popitem(last=False)
+        
+        return allowed, count, window_start + window_seconds
+    
+    def _get_tier_config(self, user_id: str, tier: str) -> TierConfig:
+        """
+        Get the configuration for a tier, falling back to minimal limits.
+        
+        Args:
+            user_id: User identifier (for logging)
+            tier: User tier
+            
+        Returns:
+            TierConfig for the tier, or conservative fallback limits
+        """
+        tier_config = config_manager.get_tier_config(tier)
+        if not tier_config:
+            logger.error(
+                f"No configuration found for tier: {tier} - using fallback limits",
+                extra={
+                    "user_id": user_id,
+                    "tier": tier,
+                    "error": "tier_config_not_found",
+                    "service_operation": "tier_config_fallback"
+                }
+            )
+            # Fallback to minimal limits
+            tier_config = TierConfig(
+                base_limit=10,
+                burst_limit=10,
+                degraded_limit=2,
+                window_minutes=1
+            )
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Tier configuration retrieved for {tier}: base={tier_config.base_limit}, "
+                f"burst={tier_config.burst_limit}, degraded={tier_config.degraded_limit}",
+                extra={
+                    "user_id": user_id,
+                    "tier": tier,
+                    "tier_config": {
+                        "base_limit": tier_config.base_limit,
+                        "burst_limit": tier_config.burst_limit,
+                        "degraded_limit": tier_config.degraded_limit,
+                        "window_minutes": tier_config.window_minutes
+                    },
+                    "service_operation": "tier_config_loaded"
+                }
+            )
+        
+        return tier_config
+    
+    def get_limit_strings(self, limit: int) -> Tuple[str, str]:
+        """
+        Get the header value and 429 message for a rate limit.
+        
+        Limits only take a handful of values (one per tier and health state),
+        so the formatted strings are memoized instead of rebuilt per request.
+        
+        Args:
+            limit: Effective rate limit
+            
+        Returns:
+            Tuple of (limit_header_value, rate_limit_exceeded_message)
+        """
+        limit_strings = self._limit_strings.get(limit)
+        if limit_strings is None:
+            limit_strings = (
+                str(limit),
+                f"You have exceeded the rate limit of {limit} requests per minute."
+            )
+            self._limit_strings[limit] = limit_strings
+        return limit_strings
+    
     def _calculate_effective_limit(self, tier: str, tier_config: TierConfig, 
                                  system_health: str) -> int:
         """
         Calculate effective rate limit based on tier and system health.
         
+        Args:
+            tier: User tier
+            tier_config: Tier configuration
+            system_health: Current system health status
+            
+        Returns:
+            Effective rate limit
+        """
+        health_index = _HEALTH_INDEX.get(system_health)
+        if health_index is None:
+            # Unknown health status; not cached so it stays visible in the logs
+            return self._select_effective_limit(tier, tier_config, system_health)
+        
+        return self._get_tier_limits(tier, tier_config)[health_index]
+    
+    def _get_tier_limits(self, tier: str, tier_config: TierConfig) -> Tuple[int, int, int]:
+        """
+        Get a tier's limits for each system health state.
+        
+        Limits are kept in a lookup table, so the policy is only evaluated
+        once per tier configuration. Reloading the config produces new
+        TierConfig objects, which invalidates the stale entries.
+        
+        Args:
+            tier: User tier
+            tier_config: Tier configuration
+            
+        Returns:
+            Tuple of (NORMAL limit, DEGRADED limit, limit for unknown health),
+            ordered to match _HEALTH_INDEX
+        """
+        entry = self._limit_table.get(tier)
+        if entry is None or entry[0] is not tier_config:
+            limits = tuple(
+                self._select_effective_limit(tier, tier_config, health)
+                for health in _HEALTH_INDEX
+            )
+            # Unknown health statuses get the base limit for safety
+            entry = (tier_config, limits + (tier_config.base_limit,))
+            self._limit_table[tier] = entry
+        
+        return entry[1]
+    
+    def _select_effective_limit(self, tier: str, tier_config: TierConfig, 
+                                system_health: str) -> int:
+        """
+        Apply the tier and system health limit policy.
+        
         Args:
             tier: User tier
             tier_config: Tier configuration
@@ -312,74 +512,24 @@ class RateLimitService:
         
         return effective_limit
     
-    async def _get_system_health_cached(self) -> str:
+    def _store_health_status(self, status: str) -> None:
         """
-        Get system health with local caching for performance.
+        Remember the latest system health observed in Redis.
         
-        Returns:
-            Current system health status
+        Args:
+            status: System health status reported by Redis
         """
-        current_time = time.time()
-        
-        # Check if we have a cached value that's still valid
-        if (self._health_cache and 
-            current_time - self._last_health_check < self._health_cache_ttl):
-            cached_status = self._health_cache.get("status", SystemHealth.NORMAL)
-            logger.debug(
-                f"Using cached system health status: {cached_status} "
-                f"(cache age: {current_time - self._last_health_check:.1f}s)",
-                extra={
-                    "cached_status": cached_status,
-                    "cache_age_seconds": current_time - self._last_health_check,
-                    "cache_ttl": self._health_cache_ttl,
-                    "service_operation": "health_cache_hit"
-                }
-            )
-            return cached_status
+        self._health_state = status
+    
+    def _cached_health_status(self) -> str:
+        """
+        Get the last known system health without touching Redis.
         
-        # Fetch fresh health status
-        try:
-            logger.debug(
-                f"Cache expired/missing, fetching fresh system health status",
-                extra={
-                    "cache_age_seconds": current_time - self._last_health_check if self._health_cache else None,
-                    "cache_ttl": self._health_cache_ttl,
-                    "service_operation": "health_cache_miss"
-                }
-            )
-            
-            health_data = await self.redis_client.get_system_health()
-            self._health_cache = health_data
-            self._last_health_check = current_time
-            
-            status = health_data.get("status", SystemHealth.NORMAL)
-            
-            logger.info(
-                f"Retrieved fresh system health status: {status}",
-                extra={
-                    "health_status": status,
-                    "updated_by": health_data.get("updated_by"),
-                    "health_timestamp": health_data.get("timestamp"),
-                    "cache_refreshed": True,
-                    "service_operation": "health_status_refreshed"
-                }
-            )
-            
-            return status
-            
-        except Exception as e:
-            logger.error(
-                f"Failed to get system health, falling back to NORMAL: {type(e).__name__}: {e}",
-                extra={
-                    "error_type": type(e).__name__,
-                    "error_message": str(e),
-                    "fallback_status": SystemHealth.NORMAL,
-                    "service_operation": "health_fetch_failed"
-                },
-                exc_info=True
-            )
-            # Fallback to NORMAL status
-            return SystemHealth.NORMAL
+        Returns:
+            Most recently observed health status, or NORMAL if none is known
+        """
+        state = self._health_state
+        return state if state is not None else SystemHealth.NORMAL
     
     async def get_user_status(self, user_id: str, tier: str) -> Dict[str, Any]:
         """
@@ -397,42 +547,97 @@ class RateLimitService:
             return {"error": f"Invalid tier: {tier}"}
         
         try:
-            # Get current rate limit status
+            # Get current rate limit status; system health comes back in the
+            # same round-trip
             status_data = await self.redis_client.get_user_rate_limit_status(
                 user_id=user_id,
-                window_minutes=tier_config.window_minutes
+                window_seconds=tier_config.window_seconds
             )
             
-            # Get system health
-            system_health = await self._get_system_health_cached()
-            effective_limit = self._calculate_effective_limit(tier, tier_config, system_health)
-            
-            # Calculate remaining requests
-            current_count = status_data.get("current_count", 0)
-            remaining = max(0, effective_limit - current_count)
-            
-            return {
-                "user_id": user_id,
-                "tier": tier,
-                "system_health": system_health,
-                "current_count": current_count,
-                "effective_limit": effective_limit,
-                "remaining": remaining,
-                "window_start": status_data.get("window_start"),
-                "window_end": status_data.get("window_end"),
-                "ttl": status_data.get("ttl"),
-                "tier_config": {
-                    "base_limit": tier_config.base_limit,
-                    "burst_limit": tier_config.burst_limit,
-                    "degraded_limit": tier_config.degraded_limit,
-                    "window_minutes": tier_config.window_minutes
-                }
-            }
+            self._store_health_status(status_data["system_health"])
+            return self._build_user_status(user_id, tier, tier_config, status_data)
             
         except Exception as e:
             logger.error(f"Failed to get user status for {user_id}: {e}")
             return {"error": str(e)}
     
+    async def get_user_statuses(self, users: List[Tuple[str, str]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get rate limit status for several users in a single Redis round-trip.
+        
+        Args:
+            users: List of (user_id, tier) tuples
+            
+        Returns:
+            Dictionary mapping user ID to the same status information as
+            get_user_status
+        """
+        statuses: Dict[str, Dict[str, Any]] = {}
+        lookups = []
+        for user_id, tier in users:
+            tier_config = config_manager.get_tier_config(tier)
+            if not tier_config:
+                statuses[user_id] = {"error": f"Invalid tier: {tier}"}
+            else:
+                lookups.append((user_id, tier, tier_config))
+        
+        if not lookups:
+            return statuses
+        
+        try:
+            status_data = await self.redis_client.get_user_rate_limit_status_many(
+                [(user_id, tier_config.window_seconds) for user_id, _, tier_config in lookups]
+            )
+        except Exception as e:
+            logger.error(f"Failed to get user statuses for {len(lookups)} users: {e}")
+            for user_id, _, _ in lookups:
+                statuses[user_id] = {"error": str(e)}
+            return statuses
+        
+        self._store_health_status(status_data[0]["system_health"])
+        for (user_id, tier, tier_config), data in zip(lookups, status_data):
+            statuses[user_id] = self._build_user_status(user_id, tier, tier_config, data)
+        return statuses
+    
+    def _build_user_status(self, user_id: str, tier: str, tier_config: TierConfig,
+                           status_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build a user status response from Redis window data.
+        
+        Args:
+            user_id: User identifier
+            tier: User tier
+            tier_config: Tier configuration
+            status_data: Window data from the Redis client
+            
+        Returns:
+            Dictionary with detailed status information
+        """
+        system_health = status_data["system_health"]
+        effective_limit = self._calculate_effective_limit(tier, tier_config, system_health)
+        
+        # Calculate remaining requests
+        current_count = status_data.get("current_count", 0)
+        remaining = max(0, effective_limit - current_count)
+        
+        return {
+            "user_id": user_id,
+            "tier": tier,
+            "system_health": system_health,
+            "current_count": current_count,
+            "effective_limit": effective_limit,
+            "remaining": remaining,
+            "window_start": status_data.get("window_start"),
+            "window_end": status_data.get("window_end"),
+            "ttl": status_data.get("ttl"),
+            "tier_config": {
+                "base_limit": tier_config.base_limit,
+                "burst_limit": tier_config.burst_limit,
+                "degraded_limit": tier_config.degraded_limit,
+                "window_minutes": tier_config.window_minutes
+            }
+        }
+    
     async def reset_user_rate_limit(self, user_id: str) -> bool:
         """
         Reset rate limit for a user (admin function).
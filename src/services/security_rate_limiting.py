@@ -24,32 +24,44 @@ class SecurityRateLimiter:
     
     async def check_invalid_key_attempts(self, ip_address: str, 
                                        max_attempts: int = 10,
-                                       window_minutes: int = 5) -> bool:
+                                       window_minutes: int = 5,
+                                       block_minutes: int = 15) -> bool:
         """
         Check if IP has exceeded invalid API key attempt limit.
         
+        The IP is blocked for block_minutes in the same Redis call that
+        detects the limit being exceeded.
+        
         Args:
             ip_address: Client IP address
             max_attempts: Maximum attempts allowed
             window_minutes: Time window in minutes
+            block_minutes: Block duration in minutes once the limit is exceeded
             
         Returns:
             True if within limit, False if exceeded
         """
         try:
-            key_suffix = f"invalid_keys:{ip_address}"
-            ttl_seconds = window_minutes * 60
-            
-            count = await self.redis_client.increment_security_counter(
-                key_suffix=key_suffix,
-                ttl_seconds=ttl_seconds
+            within_limit = await self.redis_client.check_security_counter(
+                key_suffix=f"invalid_keys:{ip_address}",
+                max_attempts=max_attempts,
+                ttl_seconds=window_minutes * 60,
+                ip_address=ip_address,
+                block_seconds=block_minutes * 60
             )
             
-            if count > max_attempts:
-                logger.warning(f"IP {ip_address} exceeded invalid API key attempts: {count}/{max_attempts}")
-                return False
+            if not within_limit:
+                logger.warning(
+                    f"IP {ip_address} exceeded {max_attempts} invalid API key attempts, "
+                    f"blocked for {block_minutes} minutes",
+                    extra={
+                        "security_alert": True,
+                        "blocked_ip": ip_address,
+                        "duration_minutes": block_minutes
+                    }
+                )
             
-            return True
+            return within_limit
             
         except Exception as e:
             logger.error(f"Failed to check invalid key attempts for {ip_address}: {e}")
@@ -5,10 +5,11 @@ This module provides services for managing user-to-tier mappings and API key res
 with comprehensive error handling.
 """
 
-import time
+import sys
 import secrets
 import logging
-from typing import Optional, Tuple, Dict, Any
+from collections import Counter
+from typing import Optional, Tuple, Dict, Any, List, Iterator
 
 from ..core.config import config_manager
 
@@ -35,10 +36,30 @@ class UserTierManager:
         self._api_key_to_user = config.api_keys.copy()
         self._user_to_tier = config.users.copy()
         
+        # API key -> (user_id, tier), so request-time resolution is one lookup
+        self._api_key_to_user_tier = {
+            api_key: (user_id, self._user_to_tier[user_id])
+            for api_key, user_id in self._api_key_to_user.items()
+            if user_id in self._user_to_tier
+        }
+        
+        # user_id -> API keys, in configuration order
+        self._user_to_api_keys: Dict[str, List[str]] = {}
+        for api_key, user_id in self._api_key_to_user.items():
+            self._user_to_api_keys.setdefault(user_id, []).append(api_key)
+        
+        orphaned_keys = len(self._api_key_to_user) - len(self._api_key_to_user_tier)
+        if orphaned_keys:
+            logger.warning(
+                f"{orphaned_keys} API keys belong to users with no tier assigned",
+                extra={
+                    "orphaned_key_count": orphaned_keys,
+                    "user_service_operation": "orphaned_api_keys"
+                }
+            )
+        
         # Count users by tier for logging
-        tier_counts = {}
-        for user_id, tier in self._user_to_tier.items():
-            tier_counts[tier] = tier_counts.get(tier, 0) + 1
+        tier_counts = dict(Counter(self._user_to_tier.values()))
         
         logger.info(
             f"Loaded {len(self._api_key_to_user)} API keys and {len(self._user_to_tier)} users",
@@ -96,54 +117,7 @@ class UserTierManager:
         Returns:
             Tuple of (user_id, tier) if found, None otherwise
         """
-        api_key_preview = api_key[:10] + "..." if api_key and len(api_key) > 10 else "None"
-        
-        logger.debug(
-            f"Looking up user and tier for API key: {api_key_preview}",
-            extra={
-                "api_key_preview": api_key_preview,
-                "has_api_key": bool(api_key),
-                "user_service_operation": "get_user_tier_start"
-            }
-        )
-        
-        user_id = self.get_user_from_api_key(api_key)
-        if not user_id:
-            logger.debug(
-                f"API key not found: {api_key_preview}",
-                extra={
-                    "api_key_preview": api_key_preview,
-                    "lookup_result": "api_key_not_found",
-                    "user_service_operation": "api_key_lookup_failed"
-                }
-            )
-            return None
-        
-        tier = self.get_tier_from_user(user_id)
-        if not tier:
-            logger.warning(
-                f"User {user_id} has no tier assigned (API key: {api_key_preview})",
-                extra={
-                    "user_id": user_id,
-                    "api_key_preview": api_key_preview,
-                    "lookup_result": "no_tier_assigned",
-                    "user_service_operation": "tier_lookup_failed"
-                }
-            )
-            return None
-        
-        logger.debug(
-            f"API key lookup successful: {api_key_preview} -> {user_id} ({tier})",
-            extra={
-                "api_key_preview": api_key_preview,
-                "user_id": user_id,
-                "tier": tier,
-                "lookup_result": "success",
-                "user_service_operation": "get_user_tier_success"
-            }
-        )
-        
-        return user_id, tier
+        return self._api_key_to_user_tier.get(api_key)
     
     def add_user(self, user_id: str, tier: str) -> bool:
         """
@@ -157,7 +131,11 @@ class UserTierManager:
             True if successful, False otherwise
         """
         if config_manager.add_user(user_id, tier):
+            # Loaded tiers are interned by the config model; match that here
+            tier = sys.intern(tier)
             self._user_to_tier[user_id] = tier
+            for api_key in self._user_to_api_keys.get(user_id, ()):
+                self._api_key_to_user_tier[api_key] = (user_id, tier)
             logger.info(f"Added user {user_id} with tier {tier}")
             return True
         return False
@@ -178,7 +156,12 @@ class UserTierManager:
             return False
         
         if config_manager.add_api_key(api_key, user_id):
+            previous_user_id = self._api_key_to_user.get(api_key)
+            if previous_user_id is not None:
+                self._user_to_api_keys[previous_user_id].remove(api_key)
             self._api_key_to_user[api_key] = user_id
+            self._user_to_api_keys.setdefault(user_id, []).append(api_key)
+            self._api_key_to_user_tier[api_key] = (user_id, self._user_to_tier[user_id])
             logger.info(f"Added API key {api_key} for user {user_id}")
             return True
         return False
@@ -194,10 +177,9 @@ class UserTierManager:
         Returns:
             Generated API key if successful, None otherwise
         """
-        # Create a unique API key with tier prefix and random token
-        timestamp = int(time.time())
-        random_token = secrets.token_urlsafe(16)
-        api_key = f"{tier}_{user_id}_{timestamp}_{random_token}"
+        # Create a unique API key with tier prefix and random token; 24
+        # random bytes make a timestamp unnecessary for uniqueness
+        api_key = tier + "_" + user_id + "_" + secrets.token_urlsafe(24)
         
         if self.add_api_key(api_key, user_id):
             return api_key
@@ -217,8 +199,7 @@ class UserTierManager:
         if not tier:
             return None
         
-        # Find all API keys for this user
-        api_keys = [key for key, uid in self._api_key_to_user.items() if uid == user_id]
+        api_keys = list(self._user_to_api_keys.get(user_id, ()))
         
         return {
             "user_id": user_id,
@@ -227,6 +208,16 @@ class UserTierManager:
             "api_key_count": len(api_keys)
         }
     
+    def iter_users(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Iterate over all users with their information, one at a time.
+        
+        Yields:
+            Tuples of (user_id, user information)
+        """
+        for user_id in self._user_to_tier:
+            yield user_id, self.get_user_info(user_id)
+    
     def list_users(self) -> Dict[str, Dict[str, Any]]:
         """
         List all users with their information.
@@ -234,7 +225,4 @@ class UserTierManager:
         Returns:
             Dictionary of user information
         """
-        users = {}
-        for user_id in self._user_to_tier.keys():
-            users[user_id] = self.get_user_info(user_id)
-        return users
+        return dict(self.iter_users())